@@ -17,6 +17,7 @@ from .ui_strings import UIStr_toolbarToggleTooltip
 # ---
 
 CALLBACK_IDS: list[int] = []
+PRESET_TOOLBARS: list[PresetsFromCSVToolbar] = []  # Toolbars alive, their background work is stopped on uninitialize
 
 # ---
 
@@ -25,12 +26,18 @@ def onGraphViewCreated(graphViewId: int, uiMgrQt: QtForPythonUIMgrWrapper, pkgMg
     if not isinstance(graph, SDSBSCompGraph):
         return
     presetToolbar = PresetsFromCSVToolbar(parent=uiMgrQt.getMainWindow(), pkgMgr=pkgMgr, graph=graph)
+    PRESET_TOOLBARS.append(presetToolbar)
+    presetToolbar.destroyed.connect(partial(onPresetToolbarDestroyed, presetToolbar))
     getLogger().info("Preset toolbar created:", presetToolbar)
     presetToolbar.csvProcessor.logCurrentOptions()
     toolbarIcon = QIcon(path.join(path.split(__file__)[0], "icons", "substance_designer.png"))
     uiMgrQt.addToolbarToGraphView(graphViewId, presetToolbar, toolbarIcon, UIStr_toolbarToggleTooltip)
     getLogger().info(f"Added toolbar to Graph view (ID={graphViewId})")
 
+def onPresetToolbarDestroyed(presetToolbar: PresetsFromCSVToolbar) -> None:
+    if presetToolbar in PRESET_TOOLBARS:
+        PRESET_TOOLBARS.remove(presetToolbar)
+
 def initializeSDPlugin():
     global CALLBACK_IDS
 
@@ -54,3 +61,7 @@ def uninitializeSDPlugin():
     for callbackId in CALLBACK_IDS:
         uiMgrSd.unregisterGraphViewCreatedCallback(callbackId)
     CALLBACK_IDS.clear()
+
+    for presetToolbar in PRESET_TOOLBARS:
+        presetToolbar.shutdown()
+    PRESET_TOOLBARS.clear()
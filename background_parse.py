@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
+from functools import partial
+from typing import Any, Callable
+import os
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from .utilities import getLogger
+from .palette import Palette
+
+# ---
+
+class BackgroundParseJob:
+
+    def __init__(self, jobKey: Any, future: Future, cancelEvent: threading.Event):
+        self.jobKey = jobKey
+        self.future = future
+        self.cancelEvent = cancelEvent
+
+
+class BackgroundPaletteParser(QObject):
+    """
+    Run a single palette parse at a time on a worker thread.
+    Scheduling a new parse cancels the one in flight, its result is never delivered.
+    """
+
+    paletteReady = Signal()  # Emitted from the worker thread, delivered on the thread owning the parser
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PresetsFromCSVParse")
+        self.__job: BackgroundParseJob | None = None
+        self.__isShutdown = False
+
+    def schedule(self, jobKey: Any, parseFunction: Callable[[threading.Event], Any]) -> None:
+        """
+        :param jobKey: Identifies the parse, e.g. the file path and the options it is parsed with.
+        :param parseFunction: Called on the worker thread with an event set once the parse is cancelled.
+        Returns the parsed palette, or any result holding it (e.g. with the diagnostics of the parse).
+        """
+        self.cancel()
+        if self.__isShutdown:
+            return  # No result will match, the palette is parsed on demand instead
+        cancelEvent = threading.Event()
+        future = self.__executor.submit(parseFunction, cancelEvent)
+        self.__job = BackgroundParseJob(jobKey, future, cancelEvent)
+        future.add_done_callback(self.__onJobDone)
+
+    def cancel(self) -> None:
+        if self.__job:
+            self.__job.cancelEvent.set()
+            self.__job.future.cancel()  # Only effective if the parse has not started yet
+            self.__job = None
+
+    def isPending(self, jobKey: Any) -> bool:
+        return self.__job is not None and self.__job.jobKey == jobKey
+
+    def takeResult(self, jobKey: Any, wait: bool) -> tuple[bool, Any]:
+        """
+        Consume the result of the current parse if it matches the given key.
+        :param jobKey: The key the parse has been scheduled with.
+        :param wait: Whether to block until a parse in flight finishes.
+        :return: Whether a result was available, and the result of the parse function (None if it raised).
+        """
+        if not self.isPending(jobKey) or (not wait and not self.__job.future.done()):
+            return False, None
+        future = self.__job.future
+        self.__job = None
+        try:
+            return True, future.result()
+        except CancelledError:
+            return False, None
+        except Exception as e:
+            getLogger().error("ERROR:" + str(e))
+            return True, None
+
+    def shutdown(self) -> None:
+        """
+        Cancel the parse and stop the worker thread, without waiting for a parse in flight.
+        """
+        self.cancel()
+        self.__isShutdown = True
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __onJobDone(self, future: Future) -> None:
+        if not future.cancelled():
+            self.paletteReady.emit()
+
+
+class BatchPaletteParser(QObject):
+    """
+    Parse several palette files at once on a pool of worker threads, e.g. every palette of a season.
+    Threads are used rather than processes: SD embeds its interpreter, so a process pool would spawn Designer itself.
+    File reads and the NumPy conversion and reduction stages release the GIL and overlap across files.
+    """
+
+    fileParsed = Signal(str, bool)  # Key of the file and whether a palette was parsed, delivered like paletteReady
+    batchReady = Signal()
+
+    def __init__(self, maxWorkers: int | None = None, parent=None):
+        super().__init__(parent)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=maxWorkers or min(8, os.cpu_count() or 1), thread_name_prefix="PresetsFromCSVBatch")
+        self.__futures: dict[str, Future] = {}
+        self.__cancelEvent = threading.Event()
+        self.__pendingCount = 0
+        self.__lock = threading.Lock()
+        self.__isShutdown = False
+
+    def start(self, parseFunctions: dict[str, Callable[[threading.Event], Palette | None]]) -> bool:
+        """
+        :param parseFunctions: File key -> function called on a worker thread with an event set once the batch is cancelled.
+        :return: False if a batch is already running, or the parser has been shut down.
+        """
+        if self.isRunning() or not parseFunctions or self.__isShutdown:
+            return False
+        self.__cancelEvent = threading.Event()
+        self.__pendingCount = len(parseFunctions)
+        self.__futures = {}
+        for fileKey, parseFunction in parseFunctions.items():
+            self.__futures[fileKey] = self.__executor.submit(parseFunction, self.__cancelEvent)
+        # Callbacks are added once every future exists, as a finished future calls them immediately
+        for fileKey, future in self.__futures.items():
+            future.add_done_callback(partial(self.__onFileDone, fileKey))
+        return True
+
+    def isRunning(self) -> bool:
+        return self.__pendingCount > 0
+
+    def cancel(self) -> None:
+        self.__cancelEvent.set()
+        for future in self.__futures.values():
+            future.cancel()
+
+    def takeResults(self) -> dict[str, tuple[Palette | None, str | None]]:
+        """
+        Consume the results of the finished batch, in the order the files were scheduled.
+        :return: File key -> (parsed palette, error message). Both are None if the file has no palette or was cancelled.
+        """
+        results: dict[str, tuple[Palette | None, str | None]] = {}
+        for fileKey, future in self.__futures.items():
+            if future.cancelled():
+                results[fileKey] = None, "Cancelled"
+                continue
+            try:
+                results[fileKey] = future.result(), None
+            except Exception as e:
+                results[fileKey] = None, str(e)
+        self.__futures = {}
+        return results
+
+    def shutdown(self) -> None:
+        """
+        Cancel the batch and stop the worker threads, without waiting for the files in flight.
+        The batch in flight is dropped, batchReady is not emitted for it.
+        """
+        self.__isShutdown = True
+        self.cancel()
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __onFileDone(self, fileKey: str, future: Future) -> None:
+        if not self.__isShutdown:
+            self.fileParsed.emit(fileKey, not future.cancelled() and future.exception() is None and future.result() is not None)
+        with self.__lock:
+            self.__pendingCount -= 1
+            isBatchDone = self.__pendingCount == 0
+        if isBatchDone and not self.__isShutdown:
+            self.batchReady.emit()
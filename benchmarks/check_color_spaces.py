@@ -0,0 +1,113 @@
+"""
+Check the accuracy and throughput of the color space conversions, outside of Substance Designer.
+
+Usage:
+    python benchmarks/check_color_spaces.py
+
+Accuracy: reference colors must convert within FLOAT_TOLERANCE of their sRGB value, and random colors must match
+a scalar implementation of each conversion (colorsys for HSV). The float output is compared at SCALAR_TOLERANCE,
+so rounding to 8 bits before the float value is built fails the check. The 8-bit rounding is checked on its own.
+Throughput: converting THROUGHPUT_COLORS colors of each space must take less than MAX_RELATIVE_TIME times
+the calibration workload of 'run_benchmarks.py', which a conversion looping over colors in Python exceeds by far.
+The script exits with status 1 if any check fails.
+"""
+
+import colorsys
+import statistics
+import sys
+
+import numpy as np
+
+from run_benchmarks import calibrationWorkload, importPluginModule, timeRuns
+
+# ---
+
+FLOAT_TOLERANCE = 1e-4  # Reference colors, their sRGB values are rounded to 4 decimals
+SCALAR_TOLERANCE = 1e-9  # Random colors against the scalar implementations
+SCALAR_COLORS = 1000
+THROUGHPUT_COLORS = 1_000_000
+MAX_RELATIVE_TIME = 3.0
+
+# Color space, normalized, channel values, expected sRGB floats
+REFERENCE_COLORS = [
+    ("sRGB", False, (136, 202, 34), (136 / 255.0, 202 / 255.0, 34 / 255.0)),
+    ("sRGB", True, (0.5, 0.25, 1.0), (0.5, 0.25, 1.0)),
+    ("Linear", True, (0.05, 0.0, 1.0), (0.2478, 0.0, 1.0)),
+    ("Linear", True, (0.5, 0.2140, 0.0), (0.7354, 0.5, 0.0)),
+    ("Linear", False, (255, 55, 0), (1.0, 0.5018, 0.0)),
+    ("HSV", False, (120, 100, 50), (0.0, 0.5, 0.0)),
+    ("HSV", False, (30, 50, 100), (1.0, 0.75, 0.5)),
+    ("HSV", True, (5.0 / 6.0, 1.0, 1.0), (1.0, 0.0, 1.0)),
+    ("Lab", False, (53.2408, 80.0925, 67.2032), (1.0, 0.0, 0.0)),
+    ("Lab", False, (100.0, 0.0, 0.0), (1.0, 1.0, 1.0)),
+    ("Lab", False, (50.0, 0.0, 0.0), (0.4663, 0.4663, 0.4663)),
+    ("CMYK", False, (0, 100, 100, 0), (1.0, 0.0, 0.0)),
+    ("CMYK", True, (0.0, 0.0, 0.0, 0.5), (0.5, 0.5, 0.5))
+]
+
+
+def scalarLinearToSRGB(value: float) -> float:
+    value = max(value, 0.0)
+    return 12.92 * value if value <= 0.0031308 else 1.055 * value ** (1.0 / 2.4) - 0.055
+
+
+# Scalar conversions of normalized channels, written independently of color_spaces
+SCALAR_CONVERSIONS = {
+    "sRGB": lambda channels: tuple(channels),
+    "Linear": lambda channels: tuple(scalarLinearToSRGB(value) for value in channels),
+    "HSV": lambda channels: colorsys.hsv_to_rgb(*channels),
+    "CMYK": lambda channels: tuple((1.0 - value) * (1.0 - channels[3]) for value in channels[:3])
+}
+
+
+def checkAccuracy(colorSpaces) -> list[str]:
+    errors: list[str] = []
+    for colorSpace, isNormalized, channelValues, expectedValues in REFERENCE_COLORS:
+        floatValues = colorSpaces.convertToSRGBFloat(np.array([channelValues]), colorSpace, isNormalized)[0]
+        if not np.allclose(floatValues, expectedValues, rtol=0.0, atol=FLOAT_TOLERANCE):
+            errors.append(f"{colorSpace} {channelValues}: {floatValues.round(4).tolist()} (Expected {list(expectedValues)})")
+        rgbValues = colorSpaces.convertToSRGB8(np.array([channelValues]), colorSpace, isNormalized)[0]
+        expectedRGBValues = [round(value * 255.0) for value in expectedValues]
+        if np.abs(rgbValues.astype(int) - expectedRGBValues).max() > 1:
+            errors.append(f"{colorSpace} {channelValues} 8-bit: {rgbValues.tolist()} (Expected {expectedRGBValues})")
+
+    randomGenerator = np.random.default_rng(0)
+    for colorSpace, scalarConversion in SCALAR_CONVERSIONS.items():
+        channelBlock = randomGenerator.random((SCALAR_COLORS, colorSpaces.COLOR_SPACE_CHANNELS[colorSpace]))
+        floatBlock = colorSpaces.convertToSRGBFloat(channelBlock, colorSpace, isNormalized=True)
+        expectedBlock = np.array([scalarConversion(channels) for channels in channelBlock.tolist()])
+        maxError = float(np.abs(floatBlock - expectedBlock).max())
+        if maxError > SCALAR_TOLERANCE:
+            errors.append(f"{colorSpace}: differs from the scalar conversion by up to {maxError:.3g}")
+    return errors
+
+
+def checkThroughput(colorSpaces) -> list[str]:
+    errors: list[str] = []
+    calibrationTime = statistics.median(timeRuns(calibrationWorkload, 5))
+    randomGenerator = np.random.default_rng(0)
+    for colorSpace, channelCount in colorSpaces.COLOR_SPACE_CHANNELS.items():
+        channelBlock = randomGenerator.random((THROUGHPUT_COLORS, channelCount))
+        conversionTime = min(timeRuns(lambda: colorSpaces.convertToSRGBFloat(channelBlock, colorSpace, True), 3))
+        relativeTime = conversionTime / calibrationTime
+        print(f"  {colorSpace:<8} {THROUGHPUT_COLORS} colors {conversionTime * 1000.0:8.1f} ms ({relativeTime:.2f}x calibration)")
+        if relativeTime > MAX_RELATIVE_TIME:
+            errors.append(f"{colorSpace}: {relativeTime:.2f}x the calibration workload (Expected at most {MAX_RELATIVE_TIME}x)")
+    return errors
+
+
+def main() -> int:
+    colorSpaces = importPluginModule("color_spaces")
+    errors = checkAccuracy(colorSpaces)
+    print(f"Accuracy: {'OK' if not errors else 'FAIL'}")
+    errors.extend(checkThroughput(colorSpaces))
+
+    if errors:
+        print("Errors:\n" + "\n".join([f"  - {error}" for error in errors]))
+        return 1
+    print(f"Color space conversions match the references, at most {MAX_RELATIVE_TIME}x the calibration workload.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
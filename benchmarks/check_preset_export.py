@@ -0,0 +1,119 @@
+"""
+Check the .sbsprs preset export against the reference file 'fixtures/presets.sbsprs', outside of Substance Designer.
+
+Usage:
+    python benchmarks/check_preset_export.py
+
+Presets are exported for float3 and float4 inputs, with names which need XML escaping, then parsed back.
+The element and attribute structure, the preset count and the value format must match the reference file.
+The UID of each input is read from the package 'fixtures/package.sbs', and must be written on every preset input.
+The script exits with status 1 if any check fails.
+
+Both fixtures are written by hand after the structure of files saved by Substance Designer, trimmed to the elements
+the export reads or writes. Replace them with files saved by Designer to check against the actual format.
+"""
+
+from os import path
+import re
+import sys
+import tempfile
+import xml.etree.ElementTree as ElementTree
+
+from run_benchmarks import BENCHMARKS_DIR, importPluginModule
+
+# ---
+
+FIXTURE_FILEPATH = path.join(BENCHMARKS_DIR, "fixtures", "presets.sbsprs")
+PACKAGE_FIXTURE_FILEPATH = path.join(BENCHMARKS_DIR, "fixtures", "package.sbs")
+FLOAT_PATTERN = r"-?\d+(\.\d+)?(e-?\d+)?"
+
+COLOR_NAMES = ["Brand_Red", 'Quote "Blue"', "Salt & Pepper", "<Angle>", "Apostrophe's"]
+
+
+def attributeNames(elements: list[ElementTree.Element]) -> tuple[set[str], set[str]]:
+    """
+    :return: The attributes found on every element, and on any element.
+    """
+    attributeSets = [set(element.attrib) for element in elements]
+    return set.intersection(*attributeSets), set.union(*attributeSets)
+
+
+def checkPresetFile(filepath: str, fixtureRoot: ElementTree.Element, expectedLabels: list[str],
+                    inputType: int, inputUid: str) -> list[str]:
+    errors: list[str] = []
+    root = ElementTree.parse(filepath).getroot()
+
+    # Root element
+    if root.tag != fixtureRoot.tag or set(root.attrib) != set(fixtureRoot.attrib):
+        errors.append(f"Root element: <{root.tag} {sorted(root.attrib)}> (Expected <{fixtureRoot.tag} {sorted(fixtureRoot.attrib)}>)")
+    if root.get("formatversion") != fixtureRoot.get("formatversion"):
+        errors.append(f"Format version: {root.get('formatversion')} (Expected {fixtureRoot.get('formatversion')})")
+
+    presets = list(root)
+    if root.get("count") != str(len(expectedLabels)) or len(presets) != len(expectedLabels):
+        errors.append(f"Count: {root.get('count')} attribute, {len(presets)} presets (Expected {len(expectedLabels)})")
+
+    # Presets, their attributes must match the reference presets
+    fixturePresets = list(fixtureRoot)
+    requiredPresetAttributes, allowedPresetAttributes = attributeNames(fixturePresets)
+    fixtureInputs = [fixturePreset[0] for fixturePreset in fixturePresets]
+    requiredInputAttributes, allowedInputAttributes = attributeNames(fixtureInputs)
+    fixtureInput = next(fixtureInput for fixtureInput in fixtureInputs if fixtureInput.get("type") == str(inputType))
+    valuePattern = re.compile(",".join([FLOAT_PATTERN] * len(fixtureInput.get("value").split(","))) + "$")
+
+    for preset, expectedLabel in zip(presets, expectedLabels):
+        if preset.tag != fixturePresets[0].tag or not requiredPresetAttributes <= set(preset.attrib) <= allowedPresetAttributes:
+            errors.append(f"Preset element: <{preset.tag} {sorted(preset.attrib)}>")
+        if preset.get("label") != expectedLabel:
+            errors.append(f"Preset label: {preset.get('label')!r} (Expected {expectedLabel!r})")
+        if len(preset) != 1 or preset[0].tag != fixtureInput.tag:
+            errors.append(f"Preset '{expectedLabel}' children: {[child.tag for child in preset]} (Expected ['{fixtureInput.tag}'])")
+            continue
+
+        presetInput = preset[0]
+        if not requiredInputAttributes <= set(presetInput.attrib) <= allowedInputAttributes:
+            errors.append(f"Preset input attributes: {sorted(presetInput.attrib)}")
+        if presetInput.get("uid") != inputUid:
+            errors.append(f"Preset input uid: {presetInput.get('uid')} (Expected {inputUid})")
+        if presetInput.get("type") != str(inputType):
+            errors.append(f"Preset input type: {presetInput.get('type')} (Expected {inputType})")
+        presetValue = presetInput.get("value", "")
+        if not valuePattern.match(presetValue) or not all(0.0 <= float(value) <= 1.0 for value in presetValue.split(",")):
+            errors.append(f"Preset value of '{expectedLabel}': {presetValue!r} (Expected the format of {fixtureInput.get('value')!r})")
+    return errors
+
+
+def main() -> int:
+    palette = importPluginModule("palette")
+    presetExport = importPluginModule("preset_export")
+
+    fixtureRoot = ElementTree.parse(FIXTURE_FILEPATH).getroot()
+    exportedPalette = palette.Palette(name="check", paletteColors=[
+        palette.PaletteColor(rgbValues=(colorIndex * 60, 255 - colorIndex * 60, 128), name=colorName)
+        for colorIndex, colorName in enumerate(COLOR_NAMES)])
+
+    errors: list[str] = []
+    with tempfile.TemporaryDirectory(prefix="presets_from_csv_check_") as workDir:
+        for inputType, inputIdentifier in ((presetExport.SBS_TYPE_FLOAT4, "color"), (presetExport.SBS_TYPE_FLOAT3, "color_rgb")):
+            inputUid = presetExport.findGraphInputUid(PACKAGE_FIXTURE_FILEPATH, "graph", inputIdentifier)
+            if inputUid is None:
+                errors.append(f"type {inputType}: UID of input '{inputIdentifier}' not found in {PACKAGE_FIXTURE_FILEPATH}")
+                continue
+            presetFilePath = path.join(workDir, f"check_{inputType}.sbsprs")
+            presetCount = presetExport.exportPresetsToSBSPRS(
+                exportedPalette, presetFilePath, "pkg://graph", inputIdentifier, inputUid, inputType)
+            if presetCount != len(COLOR_NAMES):
+                errors.append(f"Exported count: {presetCount} (Expected {len(COLOR_NAMES)})")
+            typeErrors = checkPresetFile(presetFilePath, fixtureRoot, COLOR_NAMES, inputType, inputUid)
+            print(f"  type {inputType}: {'OK' if not typeErrors else 'FAIL'}")
+            errors.extend(f"type {inputType}: {error}" for error in typeErrors)
+
+    if errors:
+        print("Errors:\n" + "\n".join([f"  - {error}" for error in errors]))
+        return 1
+    print("Preset export matches the reference file.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Lightweight stand-in for the Substance Designer 'sd' API, so the plugin modules can be imported and timed
+on a plain Python install. Only the calls made by the plugin are covered.
+"""
+
+from types import ModuleType
+from os import path
+import logging
+import sys
+
+# --- sd.api.sdbasetypes ---
+
+class ColorRGB:
+
+    def __init__(self, r: float, g: float, b: float):
+        self.r, self.g, self.b = r, g, b
+
+
+# --- sd.api values and types ---
+
+class SDValue:
+
+    def __init__(self, value):
+        self.value = value
+
+    @classmethod
+    def sNew(cls, value):
+        return cls(value)
+
+    def get(self):
+        return self.value
+
+
+class SDValueColorRGB(SDValue):
+    pass
+
+
+class SDValueString(SDValue):
+    pass
+
+
+class SDTypeFloat3:
+    pass
+
+
+class SDTypeFloat4:
+    pass
+
+
+class SDPropertyCategory:
+    Annotation = 0
+    Input = 1
+    Output = 2
+
+
+class SDProperty:
+
+    def __init__(self, identifier: str, propertyType=None, label: str = ""):
+        self.__identifier = identifier
+        self.__type = propertyType or SDTypeFloat4()
+        self.__label = label
+
+    def getId(self) -> str:
+        return self.__identifier
+
+    def getLabel(self) -> str:
+        return self.__label
+
+    def getType(self):
+        return self.__type
+
+
+# --- sd.api.sdresource ---
+
+class EmbedMethod:
+    Linked = 0
+    Embedded = 1
+
+
+class SDResource:
+
+    def __init__(self, package: "SDPackage", filepath: str):
+        self.__package = package
+        self.__filepath = filepath
+
+    def getIdentifier(self) -> str:
+        return path.splitext(path.basename(self.__filepath))[0]
+
+    def getFilePath(self) -> str:
+        return self.__filepath
+
+    def getPackage(self) -> "SDPackage":
+        return self.__package
+
+
+class SDResourceBitmap(SDResource):
+
+    @classmethod
+    def sNewFromFile(cls, package: "SDPackage", filepath: str, embedMethod: int) -> "SDResourceBitmap":
+        resource = cls(package, filepath)
+        package.addResource(resource)
+        return resource
+
+
+# --- sd.api.sdpackage ---
+
+class SDPackage:
+
+    def __init__(self, filepath: str):
+        self.__filepath = filepath
+        self.__resources: list[SDResource] = []
+
+    def getFilePath(self) -> str:
+        return self.__filepath
+
+    def addResource(self, resource: SDResource) -> None:
+        self.__resources.append(resource)
+
+    def getChildrenResources(self, isRecursive: bool) -> list[SDResource]:
+        return list(self.__resources)
+
+    def findResourceFromUrl(self, url: str) -> SDResource | None:
+        for resource in self.__resources:
+            if resource.getIdentifier() == url.split("/")[-1]:
+                return resource
+        return None
+
+
+class SDPackageMgr:
+    pass
+
+
+# --- sd.api.sbs.sdsbscompgraph ---
+
+class SDSBSPresetInput:
+
+    def __init__(self, identifier: str, value: SDValue):
+        self.__identifier = identifier
+        self.__value = value
+
+    def getIdentifier(self) -> str:
+        return self.__identifier
+
+    def getValue(self) -> SDValue:
+        return self.__value
+
+
+class SDSBSPreset:
+
+    def __init__(self, label: str):
+        self.__label = label
+        self.__inputs: list[tuple[str, SDValue]] = []  # Input objects are only built when read back
+
+    def getLabel(self) -> str:
+        return self.__label
+
+    def setLabel(self, label: str) -> None:
+        self.__label = label
+
+    def addInput(self, identifier: str, value: SDValue) -> None:
+        self.__inputs.append((identifier, value))
+
+    def getInputs(self) -> list[SDSBSPresetInput]:
+        return [SDSBSPresetInput(identifier, value) for identifier, value in self.__inputs]
+
+
+class SDSBSCompGraph:
+
+    def __init__(self, package: SDPackage | None = None, identifier: str = "graph"):
+        self.__package = package
+        self.__identifier = identifier
+        self.__presets: list[SDSBSPreset] = []
+        self.__properties: list[SDProperty] = []
+
+    def getIdentifier(self) -> str:
+        return self.__identifier
+
+    def getPackage(self) -> SDPackage | None:
+        return self.__package
+
+    def newPreset(self, label: str) -> SDSBSPreset:
+        preset = SDSBSPreset(label)
+        self.__presets.append(preset)
+        return preset
+
+    def getPresets(self) -> list[SDSBSPreset]:
+        return list(self.__presets)
+
+    def deletePreset(self, preset: SDSBSPreset) -> None:
+        self.__presets.remove(preset)
+
+    def addInputProperty(self, inputProperty: SDProperty) -> None:
+        self.__properties.append(inputProperty)
+
+    def getProperties(self, category: int) -> list[SDProperty]:
+        return list(self.__properties) if category == SDPropertyCategory.Input else []
+
+    def getPropertyAnnotationValueFromId(self, inputProperty: SDProperty, annotationId: str) -> SDValueString | None:
+        return SDValueString.sNew("color") if annotationId == "editor" else None
+
+
+# --- sd.api.sdhistoryutils ---
+
+class SDHistoryUtils:
+
+    class UndoGroup:
+
+        def __init__(self, label: str):
+            self.label = label
+
+        def __enter__(self) -> "SDHistoryUtils.UndoGroup":
+            return self
+
+        def __exit__(self, excType, excValue, traceback) -> None:
+            return None
+
+
+# --- sd ---
+
+class SDContext:
+
+    def createRuntimeLogHandler(self) -> logging.Handler:
+        return logging.NullHandler()
+
+
+__gContext = SDContext()
+
+def getContext() -> SDContext:
+    return __gContext
+
+# ---
+
+MODULES: dict[str, dict[str, object]] = {
+    "sd": {"getContext": getContext},
+    "sd.api": {
+        "SDValueColorRGB": SDValueColorRGB, "SDResourceBitmap": SDResourceBitmap, "SDSBSCompGraph": SDSBSCompGraph},
+    "sd.api.sdbasetypes": {"ColorRGB": ColorRGB},
+    "sd.api.sdvaluestring": {"SDValueString": SDValueString},
+    "sd.api.sdpackage": {"SDPackage": SDPackage},
+    "sd.api.sdpackagemgr": {"SDPackageMgr": SDPackageMgr},
+    "sd.api.sdproperty": {"SDProperty": SDProperty, "SDPropertyCategory": SDPropertyCategory},
+    "sd.api.sdresource": {"SDResource": SDResource, "EmbedMethod": EmbedMethod},
+    "sd.api.sdhistoryutils": {"SDHistoryUtils": SDHistoryUtils},
+    "sd.api.sbs": {},
+    "sd.api.sbs.sdsbscompgraph": {"SDSBSCompGraph": SDSBSCompGraph},
+    "sd.api.sbs.sdsbspreset": {"SDSBSPreset": SDSBSPreset, "SDSBSPresetInput": SDSBSPresetInput},
+    "sd.api.sdtypefloat3": {"SDTypeFloat3": SDTypeFloat3},
+    "sd.api.sdtypefloat4": {"SDTypeFloat4": SDTypeFloat4},
+}
+
+def install() -> None:
+    """
+    Register the fake 'sd' modules in sys.modules. Has no effect if the real API has already been imported.
+    """
+    if "sd" in sys.modules:
+        return
+    for moduleName, attributes in MODULES.items():
+        module = ModuleType(moduleName)
+        module.__dict__.update(attributes)
+        sys.modules[moduleName] = module
+        parentName, _, childName = moduleName.rpartition(".")
+        if parentName:
+            setattr(sys.modules[parentName], childName, module)
@@ -0,0 +1,231 @@
+"""
+Benchmark the palette parsing, preset generation and palette image export paths outside of Substance Designer.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10,1000,100000] [--repeat 3] [--tolerance 0.3] [--save-baseline]
+
+The 'sd' API is replaced by the stand-in of 'fake_sd.py'. PySide6 and Pillow must be installed.
+Results are compared against 'baseline.json', the script exits with status 1 if any case regressed.
+Timings are stored and compared relative to a fixed calibration workload timed in the same run,
+so a baseline saved on one machine still holds on a faster or slower one.
+The baseline is only meant to be saved again when a change is expected to move the timings.
+"""
+
+from types import ModuleType
+from typing import Any, Callable
+from os import path
+import argparse
+import csv
+import gc
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import fake_sd
+from synthetic_csv import generateSyntheticCSV
+
+# ---
+
+BENCHMARKS_DIR = path.dirname(path.abspath(__file__))
+PLUGIN_DIR = path.dirname(BENCHMARKS_DIR)
+PLUGIN_PACKAGE = "presets_from_csv"
+BASELINE_FILEPATH = path.join(BENCHMARKS_DIR, "baseline.json")
+NOISE_FLOOR = 0.001  # Differences below one millisecond are not reported as regressions
+MIN_CASE_TIME = 0.2  # Short cases are run until they add up to this time, so the best run is not a lucky one
+MAX_CASE_RUNS = 200
+CALIBRATION_ROWS = 50000
+
+
+def importPluginModule(moduleName: str) -> ModuleType:
+    fake_sd.install()
+    if PLUGIN_PACKAGE not in sys.modules:
+        # The plugin '__init__' registers SD application callbacks, only its submodules are imported
+        pluginPackage = ModuleType(PLUGIN_PACKAGE)
+        pluginPackage.__path__ = [PLUGIN_DIR]
+        sys.modules[PLUGIN_PACKAGE] = pluginPackage
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{moduleName}")
+
+
+def timeRuns(function: Callable[[], Any], repeat: int) -> list[float]:
+    """
+    :return: The times of at least 'repeat' runs, more if needed to reach MIN_CASE_TIME in total.
+    Like timeit, the garbage collector is paused while timing, its cost depends on what earlier cases left alive.
+    """
+    runTimes: list[float] = []
+    gc.collect()
+    gc.disable()
+    try:
+        while len(runTimes) < repeat or (sum(runTimes) < MIN_CASE_TIME and len(runTimes) < MAX_CASE_RUNS):
+            startTime = time.perf_counter()
+            function()
+            runTimes.append(time.perf_counter() - startTime)
+    finally:
+        gc.enable()
+    return runTimes
+
+
+def timeCall(function: Callable[[], Any], repeat: int) -> float:
+    return min(timeRuns(function, repeat))
+
+
+def calibrationWorkload() -> None:
+    """
+    Fixed mix of CSV parsing, integer conversion and NumPy work, close to what the benchmarked cases do.
+    """
+    csvRows = [f"Color_{rowIndex:08d},{rowIndex % 256}-{rowIndex * 7 % 256}-{rowIndex * 13 % 256}"
+               for rowIndex in range(CALIBRATION_ROWS)]
+    colorValues = [tuple(int(value) for value in rowCells[1].split("-")) for rowCells in csv.reader(csvRows)]
+    np.sort(np.array(colorValues, dtype=np.uint8), axis=0)
+
+
+def runBenchmarks(sizes: list[int], repeat: int, workDir: str) -> dict[str, float]:
+    csvProcessing = importPluginModule("csv_processing")
+    palette = importPluginModule("palette")
+    utilities = importPluginModule("utilities")
+    presetExport = importPluginModule("preset_export")
+
+    results: dict[str, float] = {}
+
+    def record(caseName: str, function: Callable[[], Any]) -> None:
+        # Warm-up run, which also checks that the synthetic file is parsed
+        if function() is None and caseName.startswith("extract"):
+            raise RuntimeError(f"{caseName}: the synthetic CSV could not be parsed.")
+        results[caseName] = timeCall(function, repeat)
+        print(f"  {caseName:<48} {results[caseName]:10.4f} s")
+
+    for rowCount in sizes:
+        print(f"{rowCount} rows")
+        layoutFiles: dict[str, tuple[str, Any]] = {}  # Layout name -> CSV file path and its processor
+        # The alpha channel has its own column in the split layout, read around by the color columns
+        for channelLayout, hasAlpha in (("joined", False), ("split", False), ("split", True)):
+            layoutName = channelLayout + ("-alpha" if hasAlpha else "")
+            csvFilePath = path.join(workDir, f"synthetic_{layoutName}_{rowCount}.csv")
+            csvOptions = generateSyntheticCSV(csvFilePath, rowCount, channelLayout=channelLayout, hasAlpha=hasAlpha)
+
+            csvProcessor = csvProcessing.CSVColorProcessor()
+            for key, value in csvOptions.items():
+                csvProcessor.setOption(key, value)
+
+            record(f"extractPalette[{layoutName}-{rowCount}]", lambda: csvProcessor.extractPalette(csvFilePath))
+            record(
+                f"extractColorsFromCSV[{layoutName}-{rowCount}]",
+                lambda: palette.extractColorsFromCSV(csvFilePath, csvProcessor.getAllOptions()))
+            layoutFiles[layoutName] = csvFilePath, csvProcessor
+
+        # Hex codes are not read by the CSV processor, their decoding is timed on the cells of the file
+        hexFilePath = path.join(workDir, f"synthetic_hex_{rowCount}.csv")
+        generateSyntheticCSV(hexFilePath, rowCount, channelLayout="hex")
+        with open(hexFilePath, "r", encoding="utf-8", newline="") as hexFile:
+            hexRows = list(csv.reader(hexFile))[1:]
+        record(f"decodeHexColors[{rowCount}]",
+               lambda: [palette.PaletteColor(hexCode=hexCode, name=colorName) for colorName, hexCode in hexRows])
+
+        csvFilePath, csvProcessor = layoutFiles["split"]
+
+        # Same channels read as Lab, through the float parse and the block conversion
+        labProcessor = csvProcessor.copy()
+        labProcessor.setOption("sourceColorSpace", "Lab")
+        record(f"extractPalette[Lab-split-{rowCount}]", lambda: labProcessor.extractPalette(csvFilePath))
+
+        parsedPalette = csvProcessor.extractPalette(csvFilePath)
+
+        def generatePresets() -> None:
+            graph = fake_sd.SDSBSCompGraph()
+            graph.addInputProperty(fake_sd.SDProperty("color"))
+            csvProcessing.generatePresetsFromColors(graph, parsedPalette, "color")
+
+        def exportPaletteImage() -> None:
+            rgbValues = list(parsedPalette.getRGBValues())
+            paletteImage = utilities.generatePaletteImageFromColors(rgbValues, size=(len(rgbValues), 1))
+            paletteImageFilePath = path.join(workDir, f"synthetic_{rowCount}_palette.png")
+            if path.exists(paletteImageFilePath):
+                os.remove(paletteImageFilePath)  # Time an actual write rather than the up-to-date check
+            utilities.savePaletteImage(paletteImage, paletteImageFilePath)
+
+        record(f"generatePresetsFromColors[{rowCount}]", generatePresets)
+        record(f"exportPresetsToSBSPRS[{rowCount}]", lambda: presetExport.exportPresetsToSBSPRS(
+            parsedPalette, path.join(workDir, f"synthetic_{rowCount}.sbsprs"), "pkg://graph", "color", "1234567890"))
+        record(f"reducePalette[median-cut-{rowCount}]", lambda: parsedPalette.reduce(256, "median-cut"))
+        record(f"reducePalette[k-means-{rowCount}]", lambda: parsedPalette.reduce(256, "k-means"))
+        # The name index is built by the warm-up run, later runs time the indexed lookup
+        record(f"filterPalette[glob-{rowCount}]", lambda: parsedPalette.filter("Color_000001*").toPalette())
+        record(f"exportPaletteImage[{rowCount}]", exportPaletteImage)
+
+    return results
+
+
+def toRelativeTimes(results: dict[str, float], calibrationTime: float) -> dict[str, float]:
+    return {caseName: elapsedTime / calibrationTime for caseName, elapsedTime in results.items()}
+
+
+def compareWithBaseline(
+        relativeTimes: dict[str, float], baseline: dict[str, float], calibrationTime: float, tolerance: float) -> list[str]:
+    """
+    :param relativeTimes: Case name -> time relative to the calibration workload.
+    :param baseline: Case name -> relative time stored in the baseline.
+    :param calibrationTime: The calibration time of this run, to express differences in seconds.
+    :param tolerance: Allowed slowdown relative to the baseline.
+    """
+    regressions: list[str] = []
+    for caseName, relativeTime in relativeTimes.items():
+        baselineTime = baseline.get(caseName)
+        if baselineTime is None:
+            continue
+        if relativeTime > baselineTime * (1.0 + tolerance) and (relativeTime - baselineTime) * calibrationTime > NOISE_FLOOR:
+            regressions.append(
+                f"{caseName}: {relativeTime:.4f} (baseline {baselineTime:.4f}, "
+                f"+{(relativeTime / baselineTime - 1.0) * 100.0:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    argumentParser = argparse.ArgumentParser(description="Benchmark the 'Presets from CSV' plugin.")
+    argumentParser.add_argument(
+        "--sizes", default="10,1000,100000", help="Comma-separated amounts of CSV rows, up to 10000000.")
+    argumentParser.add_argument("--repeat", type=int, default=3, help="Amount of runs per case, the best is kept.")
+    argumentParser.add_argument(
+        "--tolerance", type=float, default=0.3, help="Allowed slowdown relative to the baseline (0.3 = 30%%).")
+    argumentParser.add_argument("--save-baseline", action="store_true", help="Overwrite the stored baseline.")
+    arguments = argumentParser.parse_args()
+
+    sizes = [int(size) for size in arguments.sizes.split(",")]
+    # Timed before and after the cases, the median is kept so that a single lucky run does not scale every case
+    calibrationTimes = timeRuns(calibrationWorkload, max(5, arguments.repeat))
+    with tempfile.TemporaryDirectory(prefix="presets_from_csv_bench_") as workDir:
+        results = runBenchmarks(sizes, max(1, arguments.repeat), workDir)
+    calibrationTime = statistics.median(calibrationTimes + timeRuns(calibrationWorkload, max(5, arguments.repeat)))
+    print(f"Calibration: {calibrationTime:.4f} s, timings are compared in multiples of it")
+    relativeTimes = toRelativeTimes(results, calibrationTime)
+
+    if arguments.save_baseline:
+        baseline: dict[str, float] = {}
+        if path.exists(BASELINE_FILEPATH):
+            with open(BASELINE_FILEPATH, "r", encoding="utf-8") as baselineFile:
+                baseline = json.load(baselineFile)
+        baseline.update(relativeTimes)
+        with open(BASELINE_FILEPATH, "w", encoding="utf-8") as baselineFile:
+            json.dump(baseline, baselineFile, indent=4, sort_keys=True)
+        print(f"Baseline saved: {BASELINE_FILEPATH}")
+        return 0
+
+    if not path.exists(BASELINE_FILEPATH):
+        print("No baseline found, run with --save-baseline to create one.")
+        return 0
+    with open(BASELINE_FILEPATH, "r", encoding="utf-8") as baselineFile:
+        regressions = compareWithBaseline(relativeTimes, json.load(baselineFile), calibrationTime, arguments.tolerance)
+
+    if regressions:
+        print("Regressions:\n" + "\n".join([f"  - {regression}" for regression in regressions]))
+        return 1
+    print("No regression against the baseline.")
+    return 0
+
+
+if "__main__" == __name__:
+    sys.exit(main())
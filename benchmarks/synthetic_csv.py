@@ -0,0 +1,67 @@
+"""
+Deterministic generators of synthetic palette CSV files, from a handful to millions of rows.
+"""
+
+import csv
+import random
+
+# ---
+
+CHANNEL_LAYOUTS = ("joined", "split", "hex")
+
+def generateSyntheticCSV(
+        filepath: str, rowCount: int, channelLayout: str = "joined", hasLabel: bool = True, hasAlpha: bool = False,
+        hasHeader: bool = True, colorSeparator: str = "-", seed: int = 0) -> dict[str, object]:
+    """
+    Write a synthetic palette CSV file, one color per row.
+    Rows are streamed to disk, so memory usage does not depend on the amount of rows.
+    :param filepath: The path of the CSV file to write.
+    :param rowCount: The amount of colors to write.
+    :param channelLayout: 'joined' (single "R-G-B" column), 'split' (one column per channel) or 'hex' ("#RRGGBB").
+    :param hasLabel: Whether the first column holds a unique color name.
+    :param hasAlpha: Whether an alpha channel is appended to the color values.
+    :param hasHeader: Whether a header row is written first.
+    :param colorSeparator: The separator between values of the 'joined' layout.
+    :param seed: The seed of the random generator, identical seeds produce identical files.
+    :return: The CSV options matching the generated file, as expected by CSVColorProcessor.
+    """
+    if channelLayout not in CHANNEL_LAYOUTS:
+        raise ValueError(f"Unknown channel layout: {channelLayout} (Expected one of {CHANNEL_LAYOUTS})")
+
+    randomGenerator = random.Random(seed)
+    channelNames = ["r", "g", "b", "a"] if hasAlpha else ["r", "g", "b"]
+    labelColumns = 1 if hasLabel else 0
+
+    with open(filepath, "w", encoding="utf-8", newline="") as csvFile:
+        csvWriter = csv.writer(csvFile, dialect="excel")
+
+        if hasHeader:
+            header = ["name"] if hasLabel else []
+            header += channelNames if channelLayout == "split" else ["color"]
+            csvWriter.writerow(header)
+
+        for rowIndex in range(rowCount):
+            channelValues = [randomGenerator.randrange(256) for _ in channelNames]
+            row = [f"Color_{rowIndex:08d}"] if hasLabel else []
+            if channelLayout == "joined":
+                row.append(colorSeparator.join(str(value) for value in channelValues))
+            elif channelLayout == "split":
+                row.extend(str(value) for value in channelValues)
+            else:
+                row.append("#" + "".join(f"{value:02X}" for value in channelValues))
+            csvWriter.writerow(row)
+
+    if channelLayout == "split":
+        colorRow = ",".join(str(labelColumns + channelIndex) for channelIndex in range(3))
+    else:
+        colorRow = labelColumns
+
+    return {
+        "csvDialect": "excel",
+        "hasLabel": hasLabel,
+        "labelRow": 0,
+        "colorRow": colorRow,
+        "colorSeparator": colorSeparator,
+        "hasAlpha": hasAlpha,
+        "hasHeader": hasHeader
+    }
@@ -0,0 +1,111 @@
+import numpy as np
+
+# ---
+
+# Amount of channels read from the CSV for each source color space
+COLOR_SPACE_CHANNELS: dict[str, int] = {
+    "sRGB": 3,
+    "Linear": 3,
+    "HSV": 3,
+    "Lab": 3,
+    "CMYK": 4
+}
+
+# Full scale of the channels written as integers, float channels are expected in the [0, 1] range.
+# Lab channels are always read as is: L from 0 to 100, a and b roughly from -128 to 127.
+INTEGER_CHANNEL_SCALES: dict[str, tuple[float, ...]] = {
+    "sRGB": (255.0, 255.0, 255.0),
+    "Linear": (255.0, 255.0, 255.0),
+    "HSV": (360.0, 100.0, 100.0),
+    "Lab": (1.0, 1.0, 1.0),
+    "CMYK": (100.0, 100.0, 100.0, 100.0)
+}
+
+D65_WHITE_POINT = np.array([0.95047, 1.00000, 1.08883])
+
+XYZ_TO_LINEAR_SRGB = np.array([
+    [3.2404542, -1.5371385, -0.4985314],
+    [-0.9692660, 1.8760108, 0.0415560],
+    [0.0556434, -0.2040259, 1.0572252]])
+
+
+def convertToSRGB8(channelValues: np.ndarray, colorSpace: str, isNormalized: bool = False) -> np.ndarray:
+    """
+    Convert a block of colors to 8-bit sRGB, the precision of palette bitmaps.
+    See convertToSRGBFloat() for the parameters.
+    :return: The clamped RGB values, as a (N, 3) uint8 array.
+    """
+    return quantizeSRGB8(convertToSRGBFloat(channelValues, colorSpace, isNormalized))
+
+
+def convertToSRGBFloat(channelValues: np.ndarray, colorSpace: str, isNormalized: bool = False) -> np.ndarray:
+    """
+    Convert a block of colors to sRGB floats, the space of graph presets, without losing the precision of the source.
+    :param channelValues: The colors to convert, as a (N, channel count) array.
+    :param colorSpace: One of COLOR_SPACE_CHANNELS.
+    :param isNormalized: Whether the channels are floats in the [0, 1] range instead of integers, see INTEGER_CHANNEL_SCALES.
+    :return: The RGB values clamped to the [0, 1] range, as a (N, 3) float64 array.
+    """
+    channelCount = COLOR_SPACE_CHANNELS[colorSpace]
+    channelValues = np.asarray(channelValues, dtype=np.float64).reshape(-1, channelCount)
+    if not isNormalized and colorSpace != "Lab":
+        channelValues = channelValues / np.array(INTEGER_CHANNEL_SCALES[colorSpace])
+
+    if colorSpace == "sRGB":
+        srgbValues = channelValues
+    elif colorSpace == "Linear":
+        srgbValues = linearToSRGB(channelValues)
+    elif colorSpace == "HSV":
+        srgbValues = hsvToSRGB(channelValues)
+    elif colorSpace == "Lab":
+        srgbValues = linearToSRGB(labToLinearSRGB(channelValues))
+    else:
+        srgbValues = cmykToSRGB(channelValues)
+
+    return np.clip(srgbValues, 0.0, 1.0)
+
+
+def quantizeSRGB8(srgbValues: np.ndarray) -> np.ndarray:
+    """
+    :param srgbValues: sRGB floats in the [0, 1] range, see convertToSRGBFloat().
+    :return: The rounded 8-bit values, as a uint8 array of the same shape.
+    """
+    return np.clip(np.rint(srgbValues * 255.0), 0, 255).astype(np.uint8)
+
+
+def linearToSRGB(linearValues: np.ndarray) -> np.ndarray:
+    linearValues = np.maximum(linearValues, 0.0)
+    return np.where(linearValues <= 0.0031308, 12.92 * linearValues, 1.055 * linearValues ** (1.0 / 2.4) - 0.055)
+
+
+def hsvToSRGB(hsvValues: np.ndarray) -> np.ndarray:
+    hue = (hsvValues[:, 0] % 1.0) * 6.0
+    saturation = np.clip(hsvValues[:, 1], 0.0, 1.0)
+    value = hsvValues[:, 2]
+
+    sector = np.floor(hue).astype(np.intp) % 6
+    fraction = hue - np.floor(hue)
+    p = value * (1.0 - saturation)
+    q = value * (1.0 - saturation * fraction)
+    t = value * (1.0 - saturation * (1.0 - fraction))
+
+    # Channel values of each of the six hue sectors
+    return np.stack([
+        np.choose(sector, [value, q, p, p, t, value]),
+        np.choose(sector, [t, value, value, q, p, p]),
+        np.choose(sector, [p, p, t, value, value, q])], axis=1)
+
+
+def labToLinearSRGB(labValues: np.ndarray) -> np.ndarray:
+    # CIE Lab (D65 white point) to XYZ
+    fY = (labValues[:, 0] + 16.0) / 116.0
+    fXYZ = np.stack([fY + labValues[:, 1] / 500.0, fY, fY - labValues[:, 2] / 200.0], axis=1)
+    fCubed = fXYZ ** 3
+    xyzValues = np.where(fCubed > 0.008856, fCubed, (fXYZ - 16.0 / 116.0) / 7.787) * D65_WHITE_POINT
+    # XYZ to linear sRGB
+    return xyzValues @ XYZ_TO_LINEAR_SRGB.T
+
+
+def cmykToSRGB(cmykValues: np.ndarray) -> np.ndarray:
+    cmykValues = np.clip(cmykValues, 0.0, 1.0)
+    return (1.0 - cmykValues[:, :3]) * (1.0 - cmykValues[:, 3:4])
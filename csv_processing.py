@@ -1,22 +1,53 @@
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+from functools import partial
+from collections import Counter
+import threading
 from os import path
+import os
+import math
 import csv
 
+import numpy as np
+
 from PySide6 import QtWidgets, QtGui
 from PySide6.QtWidgets import QToolBar, QDialog, QVBoxLayout, QComboBox, QTextEdit, \
-                              QCheckBox, QPushButton, QSpinBox, QFrame
-from PySide6.QtCore import Qt, QRect, QPoint
+                              QCheckBox, QPushButton, QSpinBox, QFrame, QListView, QLineEdit, QListWidget, QLabel
+from PySide6.QtCore import Qt, QRect, QPoint, QSize, QAbstractListModel, QModelIndex, Signal, QTimer
 
 from sd.api import SDResourceBitmap
 from sd.api.sdresource import EmbedMethod
 from sd.api.sdpackagemgr import SDPackageMgr
+from sd.api.sbs.sdsbspreset import SDSBSPreset
 
 from .utilities import *
 from .ui_strings import *
-from .palette import Palette, PaletteColor
+from .palette import Palette, PaletteColor, PaletteDiff
+from .color_spaces import COLOR_SPACE_CHANNELS, convertToSRGBFloat, quantizeSRGB8
+from .csv_watcher import CSVResourceWatcher
+from .importers import getPaletteImporter, getPaletteImporterExtensions, isPaletteFile
+from .background_parse import BackgroundPaletteParser, BatchPaletteParser
+from .preset_transaction import PresetTransaction
+from .preset_export import exportPresetsToSBSPRS, findGraphInputUid, SBS_TYPE_FLOAT3, SBS_TYPE_FLOAT4
+from .palette_atlas import writePaletteAtlas
 
 # ---
 
+class CSVParseDiagnostic:
+
+    def __init__(self, row: int | None, column: int | None, reason: str):
+        self.row = row
+        self.column = column
+        self.reason = reason
+
+    def __str__(self) -> str:
+        if self.row is None:
+            return self.reason
+        elif self.column is None:
+            return f"({self.row}): {self.reason}"
+        else:
+            return f"({self.row}, {self.column}): {self.reason}"
+
+
 class CSVColorProcessor:
 
     CSV_OPTIONS_DEFAULTS: dict[str, Any] = {
@@ -26,12 +57,43 @@ class CSVColorProcessor:
         "colorRow": 1,
         "colorSeparator": "-",
         "colorValueFormat": int,
+        "sourceColorSpace": "sRGB",
         "hasAlpha": False,
-        "hasHeader": True
+        "hasHeader": True,
+        "tolerantParsing": False,
+        "maxDiagnostics": 100
+    }
+
+    # Options accepting more than the type of their default value (e.g. "0,1,2" for channels split into columns)
+    CSV_OPTIONS_TYPES: dict[str, tuple[type, ...]] = {
+        "colorRow": (int, str)
     }
 
     def __init__(self):
-        self.__options: dict[str, Any] = CSVColorProcessor.CSV_OPTIONS_DEFAULTS
+        self.__options: dict[str, Any] = dict(CSVColorProcessor.CSV_OPTIONS_DEFAULTS)
+        self.__diagnostics: list[CSVParseDiagnostic] = []  # The first issues, up to the 'maxDiagnostics' option
+        self.__diagnosticsCount: int = 0
+        self.__lastIssue: CSVParseDiagnostic | None = None
+        self.__deferDiagnostics: bool = False
+        self.__optionsChangedCallbacks: list[Callable[[], None]] = []
+
+    def copy(self, deferDiagnostics: bool = False) -> "CSVColorProcessor":
+        """
+        Create a processor with a snapshot of the current options, e.g. to parse on another thread.
+        :param deferDiagnostics: Whether the copy keeps the issues of its parses without logging them,
+        so that they are logged from the main thread, see takeDiagnostics().
+        """
+        csvProcessor = CSVColorProcessor()
+        csvProcessor.__options = dict(self.__options)
+        csvProcessor.__deferDiagnostics = deferDiagnostics
+        return csvProcessor
+
+    def addOptionsChangedCallback(self, callback: Callable[[], None]) -> None:
+        self.__optionsChangedCallbacks.append(callback)
+
+    def __notifyOptionsChanged(self) -> None:
+        for callback in self.__optionsChangedCallbacks:
+            callback()
 
     def getOption(self, identifier: str) -> Any | None:
         if identifier in CSVColorProcessor.CSV_OPTIONS_DEFAULTS:
@@ -45,13 +107,16 @@ class CSVColorProcessor:
 
     def setOption(self, identifier: str, value: Any) -> bool:
         if identifier in CSVColorProcessor.CSV_OPTIONS_DEFAULTS:
-            if isinstance(value, CSVColorProcessor.CSV_OPTIONS_DEFAULTS[identifier].__class__):
+            expectedTypes = CSVColorProcessor.CSV_OPTIONS_TYPES.get(
+                identifier, (CSVColorProcessor.CSV_OPTIONS_DEFAULTS[identifier].__class__,))
+            if isinstance(value, expectedTypes):
                 self.__options[identifier] = value
+                self.__notifyOptionsChanged()
                 return True
             else:
                 getLogger().error(
                     f"Value is of wrong type: {value.__class__} \
-                    (Expected: {CSVColorProcessor.CSV_OPTIONS_DEFAULTS[identifier].__class__})")
+                    (Expected: {', '.join(str(expectedType) for expectedType in expectedTypes)})")
                 return False
         else:
             getLogger().error(f"Option not found: {identifier}")
@@ -60,6 +125,7 @@ class CSVColorProcessor:
     def resetOption(self, identifier: str) -> bool:
         if identifier in CSVColorProcessor.CSV_OPTIONS_DEFAULTS:
             self.__options[identifier] = CSVColorProcessor.CSV_OPTIONS_DEFAULTS[identifier]
+            self.__notifyOptionsChanged()
             return True
         else:
             getLogger().error(f"Option not found: {identifier}")
@@ -67,73 +133,235 @@ class CSVColorProcessor:
 
     def resetAllOptions(self) -> None:
         self.__options = {key: value for key, value in CSVColorProcessor.CSV_OPTIONS_DEFAULTS.items()}
+        self.__notifyOptionsChanged()
 
     def logCurrentOptions(self):
         optionsPrettyPrint = "\n".join(
             [f"  - {key}: {value}" for key, value in self.__options.items()])
         getLogger().info(f"Current options:\n{optionsPrettyPrint}")
 
-    def extractPalette(self, filepath: str) -> Palette | None:
+    def getDiagnostics(self) -> list[CSVParseDiagnostic]:
+        return list(self.__diagnostics)
+
+    def getDiagnosticsCount(self) -> int:
+        """
+        Get the total amount of issues found by the last parse.
+        This may exceed the amount of stored diagnostics, as only the first 'maxDiagnostics' issues are stored.
+        """
+        return self.__diagnosticsCount
+
+    def takeDiagnostics(self, csvProcessor: "CSVColorProcessor", filepath: str) -> None:
+        """
+        Take over and log the diagnostics of another processor, e.g. a copy which parsed on a worker thread.
+        """
+        self.__diagnostics = csvProcessor.getDiagnostics()
+        self.__diagnosticsCount = csvProcessor.getDiagnosticsCount()
+        self.logDiagnostics(filepath)
+
+    def logDiagnostics(self, filepath: str) -> None:
+        if not self.__diagnosticsCount:
+            return
+        diagnosticsPrettyPrint = "\n".join([f"  - {diagnostic}" for diagnostic in self.__diagnostics])
+        droppedCount = self.__diagnosticsCount - len(self.__diagnostics)
+        if droppedCount > 0:
+            diagnosticsPrettyPrint += f"\n  ... and {droppedCount} more"
+        getLogger().warning(f"Found {self.__diagnosticsCount} issues in {filepath}:\n{diagnosticsPrettyPrint}")
+
+    def extractPalette(self, filepath: str, cancelEvent: threading.Event | None = None) -> Palette | None:
+        self.__clearDiagnostics()
+        # Invalid column options fail every row, even in tolerant mode
+        colorColumns = self.__resolveColorColumns()
+        if colorColumns is None:
+            getLogger().error(f"Invalid CSV options {self.__lastIssue}")
+            return None
+
+        paletteColors: list[PaletteColor] = []
+        # Colors which are not 8-bit sRGB integers are gathered, then converted as a single block
+        needsConversion = self.__needsConversion()
+        channelRows: list[tuple[float, ...]] = []
+        colorNames: list[str | None] = []
+
         try:
             with open(filepath, "r", encoding="utf-8", newline="") as csvFile:
                 csvReader = csv.reader(csvFile, delimiter=",", dialect=self.__options["csvDialect"])
-                csvValues = [row for row in csvReader]
+                for rowIndex, (colorValues, colorName) in enumerate(self.__parseRows(csvReader, colorColumns)):
+                    if cancelEvent and rowIndex % 4096 == 0 and cancelEvent.is_set():
+                        return None
+                    if colorValues is None:
+                        if self.__options["tolerantParsing"]:
+                            continue  # Skip invalid row, the issue has been stored as a diagnostic
+                        getLogger().error(f"Invalid CSV row {self.__lastIssue}")
+                        return None
+                    if needsConversion:
+                        channelRows.append(colorValues)
+                        colorNames.append(colorName)
+                    else:
+                        paletteColors.append(PaletteColor(rgbValues=colorValues, name=colorName))
+
+            if channelRows:
+                # Presets get the converted floats, only bitmaps and color matching use the 8-bit values
+                floatArray = convertToSRGBFloat(
+                    np.array(channelRows, dtype=np.float64), self.__options["sourceColorSpace"],
+                    isNormalized=self.__options["colorValueFormat"] is float)
+                paletteColors = [PaletteColor(rgbValues=tuple(rgbValues), name=colorName, floatValues=tuple(floatValues))
+                                 for rgbValues, floatValues, colorName
+                                 in zip(quantizeSRGB8(floatArray).tolist(), floatArray.tolist(), colorNames)]
         except Exception as e:
             getLogger().error("ERROR:" + str(e))
             return None
 
-        paletteColors: list[PaletteColor] = []
-
-        if self.__options["hasHeader"]:
-            csvValues = csvValues[1:]  # Skip header row
-
-        for rowIndex, rowCells in enumerate(csvValues):
-            colorValueList: list[int] = []
-            if "," in self.__options["colorRow"]:
-                colorColumns = self.__options["colorRow"].split(",")
-                if len(colorColumns) == 3:
-                    for columnIndex in colorColumns:
-                        if columnIndex.isdigit() and columnIndex < len(rowCells):
-                            cellValue = rowCells[columnIndex]
-                            if cellValue.isdigit():
-                                colorValueList.append(int(cellValue))
-                            else:
-                                getLogger().error(
-                                    f"Invalid color value in cell ({rowIndex}, {columnIndex}): {cellValue}")
-                        else:
-                            getLogger().error(f"Invalid column index: {columnIndex}")
-                            return None
-                else:
-                    getLogger().error(f"Invalid amount of columns: {len(colorColumns)}. Specify 3 columns for RGB.")
-            else:
-                columnIndex = self.__options["colorRow"]
-                if columnIndex.isdigit() and int(columnIndex) < len(rowCells):
-                    cellValues: list[str] = rowCells[int(self.__options["colorRow"])].split(self.__options["colorSeparator"])
-                    if len(cellValues) == 3:
-                        for cellValue in cellValues:
-                            if cellValue.isdigit():
-                                colorValueList.append(int(cellValue))
-                            else:
-                                getLogger().error(
-                                    f"Invalid color value in cell ({rowIndex}, {columnIndex}): {cellValue}")
-                                return None
-                    else:
-                        getLogger().error(f"Invalid amount of values: {len(cellValues)}. Specify 3 values for RGB.")
-                        return None
-                else:
-                    getLogger().error(f"Invalid column index: {columnIndex}")
-                    return None
+        if not self.__deferDiagnostics:
+            self.logDiagnostics(filepath)
+        return Palette(name=path.splitext(path.basename(filepath))[0], paletteColors=paletteColors)
 
-            rgbValues: tuple[int, int, int] = tuple(*colorValueList)
+    def validateCSV(self, filepath: str) -> bool:
+        """
+        Check every row of a CSV file against the current options without building any color.
+        Cells are only checked, no value is converted. Issues are collected as diagnostics regardless of the 'tolerantParsing' option.
+        :param filepath: The path of the CSV file to validate.
+        :return: True if no issue was found, False otherwise.
+        """
+        self.__clearDiagnostics()
+
+        colorColumns = self.__resolveColorColumns()
+        if colorColumns is not None:
+            try:
+                with open(filepath, "r", encoding="utf-8", newline="") as csvFile:
+                    csvReader = csv.reader(csvFile, delimiter=",", dialect=self.__options["csvDialect"])
+                    for _ in self.__parseRows(csvReader, colorColumns, buildColors=False):
+                        pass
+            except Exception as e:
+                self.__reportIssue(None, None, str(e))
+
+        if self.__diagnosticsCount:
+            self.logDiagnostics(filepath)
+            return False
+        getLogger().info(f"No issues found in {filepath}")
+        return True
+
+    def __clearDiagnostics(self) -> None:
+        self.__diagnostics = []
+        self.__diagnosticsCount = 0
+        self.__lastIssue = None
+
+    def __reportIssue(self, row: int | None, column: int | None, reason: str) -> None:
+        self.__diagnosticsCount += 1
+        self.__lastIssue = CSVParseDiagnostic(row=row, column=column, reason=reason)
+        # Keep the first issues, which point to where a file needs fixing, later ones are only counted
+        if len(self.__diagnostics) < max(1, self.__options["maxDiagnostics"]):
+            self.__diagnostics.append(self.__lastIssue)
+
+    def __needsConversion(self) -> bool:
+        return self.__options["sourceColorSpace"] != "sRGB" or self.__options["colorValueFormat"] is not int
+
+    def __resolveColorColumns(self) -> list[int] | None:
+        colorSpace = self.__options["sourceColorSpace"]
+        if colorSpace not in COLOR_SPACE_CHANNELS:
+            self.__reportIssue(None, None, f"Unsupported color space: {colorSpace}")
+            return None
+        channelCount = COLOR_SPACE_CHANNELS[colorSpace]
+        colorRow = str(self.__options["colorRow"])
+
+        # Channels split into multiple columns
+        if "," in colorRow:
+            colorColumns = [columnIndex.strip() for columnIndex in colorRow.split(",")]
+            if len(colorColumns) != channelCount:
+                self.__reportIssue(
+                    None, None,
+                    f"Invalid amount of columns: {len(colorColumns)}. Specify {channelCount} columns for {colorSpace}.")
+                return None
+        # Channels in a single column
+        else:
+            colorColumns = [colorRow.strip()]
 
-            if self.__options["hasLabel"] and self.__options["labelRow"].isdigit():
-                colorName = rowCells[int(self.__options["labelRow"])]
+        for columnIndex in colorColumns:
+            if not columnIndex.isdigit():
+                self.__reportIssue(None, None, f"Invalid column index: {columnIndex}")
+                return None
+        return [int(columnIndex) for columnIndex in colorColumns]
+
+    def __parseColorValues(
+            self, rowIndex: int, rowCells: list[str], colorColumns: list[int],
+            buildColors: bool = True) -> tuple[int | float, ...] | None:
+        """
+        :param buildColors: Whether to return the color values, or only check the cells and return an empty tuple if valid.
+        :return: The 8-bit sRGB values, or the raw channel values if the colors must be converted (see __needsConversion).
+        """
+        colorSpace = self.__options["sourceColorSpace"]
+        channelCount = COLOR_SPACE_CHANNELS[colorSpace]
+        cellValues: list[tuple[int, str]] = []
+        for columnIndex in colorColumns:
+            if columnIndex >= len(rowCells):
+                self.__reportIssue(
+                    rowIndex, columnIndex, f"Column index is out of range for CSV row with length {len(rowCells)}.")
+                return None
+            if len(colorColumns) == 1:
+                splitValues = rowCells[columnIndex].split(self.__options["colorSeparator"])
+                if len(splitValues) != channelCount:
+                    self.__reportIssue(
+                        rowIndex, columnIndex,
+                        f"Invalid amount of values: {len(splitValues)}. Specify {channelCount} values for {colorSpace}.")
+                    return None
+                cellValues.extend((columnIndex, cellValue) for cellValue in splitValues)
             else:
-                colorName = None
+                cellValues.append((columnIndex, rowCells[columnIndex]))
+
+        if self.__needsConversion():
+            # Float and signed values (e.g. Lab a and b channels), converted later with the whole block
+            channelValueList: list[float] = []
+            for columnIndex, cellValue in cellValues:
+                cellValue = cellValue.strip()
+                try:
+                    channelValue = float(cellValue)
+                except ValueError:
+                    channelValue = math.nan
+                if not math.isfinite(channelValue):
+                    self.__reportIssue(rowIndex, columnIndex, f"Invalid color value: {cellValue!r}")
+                    return None
+                if buildColors:
+                    channelValueList.append(channelValue)
+            return tuple(channelValueList)
+
+        colorValueList: list[int] = []
+        for columnIndex, cellValue in cellValues:
+            cellValue = cellValue.strip()  # Repair stray whitespace around values
+            if not cellValue.isdigit():
+                self.__reportIssue(rowIndex, columnIndex, f"Invalid color value: {cellValue!r}")
+                return None
+            if buildColors:
+                colorValueList.append(int(cellValue))
 
-            paletteColors.append(PaletteColor(rgbValues=rgbValues, name=colorName))
+        return tuple(colorValueList)
 
-        return Palette(name=path.splitext(path.basename(filepath))[0], paletteColors=paletteColors)
+    def __parseLabel(self, rowIndex: int, rowCells: list[str]) -> str | None:
+        if not self.__options["hasLabel"]:
+            return None
+        labelColumn = int(self.__options["labelRow"])
+        if labelColumn < len(rowCells) and rowCells[labelColumn].strip():
+            return rowCells[labelColumn].strip()
+        # Repair missing label by falling back to the hex code of the color
+        self.__reportIssue(rowIndex, labelColumn, "Missing label, the hex code will be used instead.")
+        return None
+
+    def __parseRows(
+            self, csvReader: Iterable[list[str]], colorColumns: list[int],
+            buildColors: bool = True) -> Iterator[tuple[tuple[int | float, ...] | None, str | None]]:
+        """
+        Parse CSV rows lazily and yield (color values, label) pairs.
+        Invalid rows yield None RGB values, the reason is stored as a diagnostic.
+        :param colorColumns: The columns holding the color channels, see __resolveColorColumns.
+        :param buildColors: Whether to yield the color values, or only check the rows (see __parseColorValues).
+        """
+        for rowIndex, rowCells in enumerate(csvReader):
+            if rowIndex == 0 and self.__options["hasHeader"]:
+                continue  # Skip header row
+            if not rowCells:
+                continue  # Skip blank lines
+            colorValues = self.__parseColorValues(rowIndex, rowCells, colorColumns, buildColors)
+            if colorValues is None:
+                yield None, None
+                continue
+            yield colorValues, self.__parseLabel(rowIndex, rowCells)
 
 
 # ---
@@ -151,10 +379,57 @@ class PresetsFromCSVToolbar(QToolBar):
 
         self.csvProcessor = CSVColorProcessor()
 
+        # Last imported state of each CSV resource, used by watch mode to patch presets and bitmaps incrementally.
+        # Files are prepared again with the name filter and reduction of their import, the dialog may have changed since.
+        self.__presetPalettes: dict[str, Palette] = {}
+        self.__presetExclusions: dict[str, set[str]] = {}  # CSV file path -> names unchecked in the preview
+        self.__presetTargets: dict[str, str] = {}  # CSV file path -> graph input identifier
+        self.__ownedPresets: dict[str, dict[str, SDSBSPreset]] = {}  # CSV file path -> presets created from it, by label
+        self.__presetPreparations: dict[str, dict[str, Any]] = {}  # CSV file path -> settings of the presets import
+        self.__paletteBitmapTargets: dict[str, dict[str, Any]] = {}  # CSV file path -> settings of the bitmap import
+        self.__atlasPalettes: dict[str, Palette] = {}  # File path -> palette packed in the atlas, in row order
+
+        self.csvWatcher = CSVResourceWatcher(parent=self)
+        self.csvWatcher.resourceChanged.connect(self.onCSVResourceChanged)
+
         self.optionsDialog = CSVOptionsDialog(self.csvProcessor)
         self.presetsFromCSVDialog = PresetsFromCSVDialog()
         self.presetsFromCSVDialog.createPresetsButton.clicked.connect(self.createPresetsFromCSV)
         self.presetsFromCSVDialog.createPaletteButton.clicked.connect(self.createPaletteBitmapFromCSV)
+        self.presetsFromCSVDialog.createAtlasButton.clicked.connect(self.createPaletteAtlasFromPackage)
+        self.presetsFromCSVDialog.exportPresetsButton.clicked.connect(self.exportPresetsFromCSV)
+        self.presetsFromCSVDialog.validateButton.clicked.connect(self.validateCSV)
+        self.__previewOptions: dict[str, Any] = {}  # Options the preview has been prepared with
+
+        # Speculative parse of the selected resource, so that creating presets consumes a ready result
+        self.backgroundParser = BackgroundPaletteParser(parent=self)
+        self.backgroundParser.paletteReady.connect(self.onPreParseReady)
+        self.__preParseTimer = QTimer(self)
+        self.__preParseTimer.setSingleShot(True)
+        self.__preParseTimer.setInterval(100)  # Coalesce bursts of option changes (e.g. options reset)
+        self.__preParseTimer.timeout.connect(self.schedulePreParse)
+        # Signal arguments must not reach QTimer.start(), which would take them as the interval
+        self.presetsFromCSVDialog.csvResourceCombobox.currentIndexChanged.connect(lambda: self.__preParseTimer.start())
+        self.presetsFromCSVDialog.reduceColorCountSpinbox.valueChanged.connect(lambda: self.__preParseTimer.start())
+        self.presetsFromCSVDialog.reduceMethodCombobox.currentIndexChanged.connect(lambda: self.__preParseTimer.start())
+        self.presetsFromCSVDialog.nameFilterLineEdit.editingFinished.connect(self.__preParseTimer.start)
+        self.presetsFromCSVDialog.nameFilterModeCombobox.currentIndexChanged.connect(lambda: self.__preParseTimer.start())
+        self.csvProcessor.addOptionsChangedCallback(self.__preParseTimer.start)
+        self.destroyed.connect(self.backgroundParser.shutdown)  # Worker threads are not owned by Qt
+
+        # Import of several resources at once, parsed concurrently then applied in a single batch
+        self.batchParser = BatchPaletteParser(parent=self)
+        self.batchParser.fileParsed.connect(self.onBatchFileParsed)
+        self.batchParser.batchReady.connect(self.onBatchReady)
+        self.presetsFromCSVDialog.batchImportButton.clicked.connect(self.importCheckedResources)
+        self.destroyed.connect(self.batchParser.shutdown)
+        self.__batchImport: dict[str, Any] = {}  # Resources and targets of the batch in flight
+
+        # Palettes of the atlas, parsed on their own pool so that an import and the atlas can run at the same time
+        self.atlasParser = BatchPaletteParser(parent=self)
+        self.atlasParser.batchReady.connect(self.onAtlasPalettesReady)
+        self.destroyed.connect(self.atlasParser.shutdown)
+        self.__atlasParse: dict[str, Any] = {}  # Resources and CSV processors of the atlas parse in flight
 
         self.optionsAction = QtGui.QAction("Options", self)
         self.optionsAction.triggered.connect(self.displayOptions)
@@ -164,48 +439,472 @@ class PresetsFromCSVToolbar(QToolBar):
         self.createPresetsAction.triggered.connect(self.displayPresetsFromCSVDialog)
         self.addAction(self.createPresetsAction)
 
-    def createPresetsFromCSV(self) -> None:
-
-        def generatePresetsFromColors(
-                graph: SDSBSCompGraph, palette: Palette | None, graphInputIdentifier: str) -> None:
-            if not palette:
-                getLogger().warning("No colors to generate presets from.")
-                return None
-            for colorName, color in palette.getColors().items():
-                getLogger().info("Generating presets for color: " + colorName)
-                preset = graph.newPreset(colorName)
-                preset.addInput(graphInputIdentifier, color.colorToSDValueRGB())
-                getLogger().info(f"Generated preset: {colorName} - {color.rgbValues}")
+        self.watchAction = QtGui.QAction("Watch", self)
+        self.watchAction.setCheckable(True)
+        self.watchAction.setToolTip(UIStr_watchActionTooltip)
+        self.watchAction.toggled.connect(self.toggleWatchMode)
+        self.addAction(self.watchAction)
 
+    def createPresetsFromCSV(self) -> None:
         # TODO Handle update of existing presets
         csvFilePath: str = self.presetsFromCSVDialog.csvResourceCombobox.currentData()
-        colorInputProp: str = self.presetsFromCSVDialog.graphColorCombobox.currentText()
-        palette: Palette | None = self.csvProcessor.extractPalette(csvFilePath)
+        colorInputProp: str = self.presetsFromCSVDialog.graphColorCombobox.currentData().getId()
+        palette: Palette | None = self.getPreviewSelection(csvFilePath)
 
         if palette:
             getLogger().info(f"Found {palette.length()} colors: " + ", ".join(palette.getNames()))
             getLogger().info("Creating presets...")
-            generatePresetsFromColors(self.graph, palette, colorInputProp)
+            createdPresets = generatePresetsFromColors(self.graph, palette, colorInputProp)
+            if createdPresets is None:
+                return
+            self.__presetPalettes[csvFilePath] = palette
+            self.__ownedPresets[csvFilePath] = createdPresets
+            self.__presetExclusions[csvFilePath] = self.presetsFromCSVDialog.paletteModel.getUncheckedNames()
+            self.__presetTargets[csvFilePath] = colorInputProp
+            self.__presetPreparations[csvFilePath] = self.getPreparationSettings()  # The filter and reduction of the preview
         else:
             getLogger().info("No colors found in CSV.")
 
+    def exportPresetsFromCSV(self) -> str | None:
+        csvFilePath: str = self.presetsFromCSVDialog.csvResourceCombobox.currentData()
+        colorInput: SDProperty = self.presetsFromCSVDialog.graphColorCombobox.currentData()
+        palette: Palette | None = self.getPreviewSelection(csvFilePath)
+        if not palette:
+            getLogger().info("No colors found in CSV.")
+            return None
+
+        # Preset inputs are matched by UID, which is only known from the saved package
+        inputUid = findGraphInputUid(self.package.getFilePath(), self.graph.getIdentifier(), colorInput.getId())
+        if inputUid is None:
+            getLogger().error(
+                f"Could not find the UID of input '{colorInput.getId()}' in {self.package.getFilePath()}, "
+                "save the package then export again.")
+            return None
+
+        presetFilePath, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, UIStr_exportPresetsButton, path.join(self.packageDir, palette.name + ".sbsprs"), "Presets (*.sbsprs)")
+        if not presetFilePath:
+            return None
+
+        inputType = SBS_TYPE_FLOAT3 if isinstance(colorInput.getType(), SDTypeFloat3) else SBS_TYPE_FLOAT4
+        presetCount = exportPresetsToSBSPRS(
+            palette, presetFilePath, "pkg://" + self.graph.getIdentifier(), colorInput.getId(), inputUid, inputType)
+        getLogger().info(f"Exported {presetCount} presets to {presetFilePath}")
+        return presetFilePath
+
     def createPaletteBitmapFromCSV(self) -> SDResourceBitmap | None:
         csvFilePath: str = self.presetsFromCSVDialog.csvResourceCombobox.currentData()
-        palette: Palette | None = self.csvProcessor.extractPalette(csvFilePath)
+        resourceId: str = self.presetsFromCSVDialog.csvResourceCombobox.currentText()
+        palette: Palette | None = self.getPreviewPalette(csvFilePath)
 
         if palette:
             getLogger().info(f"Found {palette.length()} colors: " + ", ".join(palette.getNames()))
             getLogger().info("Creating palette bitmap...")
-            paletteImage = generatePaletteImageFromColors(list(palette.getRGBValues()))
-            paletteImageFilePath = path.join(
-                self.packageResourcesDir, self.presetsFromCSVDialog.csvResourceCombobox.currentText() + "_palette.png")
-            paletteImage.save(paletteImageFilePath)
-            paletteBitmapResource = SDResourceBitmap.sNewFromFile(self.package, paletteImageFilePath, EmbedMethod.Linked)  # TODO Use 'Resources' folder instead of package root
-            return paletteBitmapResource
+            return self.createPaletteBitmap(palette, resourceId, csvFilePath, self.getPreparationSettings())
         else:
             getLogger().info("No colors found in CSV.")
             return None
 
+    def createPaletteBitmap(
+            self, palette: Palette, resourceId: str, csvFilePath: str, preparationSettings: dict[str, Any]) -> SDResourceBitmap:
+        paletteImageFilePath = self.writePaletteImage(palette, resourceId)
+        paletteBitmapResource = findResourceFromFilePath(self.package, paletteImageFilePath)
+        if paletteBitmapResource:
+            getLogger().info(f"Reusing existing palette bitmap resource: {paletteBitmapResource.getIdentifier()}")
+        else:
+            paletteBitmapResource = SDResourceBitmap.sNewFromFile(self.package, paletteImageFilePath, EmbedMethod.Linked)  # TODO Use 'Resources' folder instead of package root
+        self.__paletteBitmapTargets[csvFilePath] = preparationSettings
+        return paletteBitmapResource
+
+    def importCheckedResources(self) -> bool:
+        dialog = self.presetsFromCSVDialog
+        checkedResources = dialog.getCheckedBatchResources()
+        if not checkedResources:
+            getLogger().info("No resources checked for import.")
+            return False
+
+        # Every file is prepared like the preview of the selected resource.
+        # Each file is parsed with its own copy of the CSV processor, their diagnostics are logged once the batch is ready.
+        preparationSettings = self.getPreparationSettings()
+        batchProcessors = {resourceId: self.csvProcessor.copy(deferDiagnostics=True) for resourceId in checkedResources}
+        parseFunctions = {resourceId: partial(
+            preparePalette, csvFilePath, batchProcessors[resourceId],
+            preparationSettings["reduceColorCount"], preparationSettings["reduceMethod"],
+            preparationSettings["nameFilter"], preparationSettings["nameFilterMode"])
+            for resourceId, csvFilePath in checkedResources.items()}
+        if not self.batchParser.start(parseFunctions):
+            getLogger().warning("An import is already running.")
+            return False
+
+        colorInput: SDProperty | None = dialog.graphColorCombobox.currentData()
+        self.__batchImport = {
+            "resources": checkedResources,
+            "processors": batchProcessors,
+            "colorInputId": colorInput.getId() if colorInput and dialog.batchPresetsCheckbox.isChecked() else None,
+            "createBitmaps": dialog.batchBitmapsCheckbox.isChecked(),
+            "preparationSettings": preparationSettings
+        }
+        for resourceId in checkedResources:
+            dialog.setBatchResourceStatus(resourceId, "Parsing...")
+        dialog.batchImportButton.setEnabled(False)
+        dialog.batchStatusLabel.setText(f"Parsing {len(checkedResources)} files...")
+        getLogger().info(f"Importing {len(checkedResources)} files: " + ", ".join(checkedResources))
+        return True
+
+    def onBatchFileParsed(self, resourceId: str, isParsed: bool) -> None:
+        self.presetsFromCSVDialog.setBatchResourceStatus(resourceId, "Parsed" if isParsed else "Parse failed", not isParsed)
+
+    def onBatchReady(self) -> None:
+        dialog = self.presetsFromCSVDialog
+        batchResources: dict[str, str] = self.__batchImport["resources"]
+        for resourceId, batchProcessor in self.__batchImport["processors"].items():
+            self.csvProcessor.takeDiagnostics(batchProcessor, batchResources[resourceId])
+        fileStatuses = self.applyBatchImport(
+            self.batchParser.takeResults(), batchResources, self.__batchImport["colorInputId"],
+            self.__batchImport["createBitmaps"], self.__batchImport["preparationSettings"])
+        self.__batchImport = {}
+
+        failedCount = 0
+        for resourceId, (status, isError) in fileStatuses.items():
+            dialog.setBatchResourceStatus(resourceId, status, isError)
+            failedCount += isError
+        dialog.batchStatusLabel.setText(f"Imported {len(fileStatuses) - failedCount}/{len(fileStatuses)} files")
+        dialog.batchImportButton.setEnabled(True)
+        getLogger().info(
+            f"Imported {len(fileStatuses) - failedCount} of {len(fileStatuses)} files:\n" +
+            "\n".join([f"  - {resourceId}: {status}" for resourceId, (status, _) in fileStatuses.items()]))
+
+    def applyBatchImport(
+            self, parseResults: dict[str, tuple[Palette | None, str | None]], batchResources: dict[str, str],
+            colorInputId: str | None, createBitmaps: bool, preparationSettings: dict[str, Any]) -> dict[str, tuple[str, bool]]:
+        """
+        Create the presets of every parsed palette in a single transaction, then their palette bitmaps.
+        Must run on the main thread, as it calls the SD API.
+        :param parseResults: Resource identifier -> (parsed palette, parse error).
+        :param batchResources: Resource identifier -> file path.
+        :param colorInputId: The graph input to create presets for, None to skip presets.
+        :param createBitmaps: Whether to create a palette bitmap per file.
+        :param preparationSettings: The settings the palettes were prepared with, see getPreparationSettings().
+        :return: Resource identifier -> (status, whether the import of the file failed).
+        """
+        fileStatuses: dict[str, tuple[str, bool]] = {}
+        palettes: dict[str, Palette] = {}
+        for resourceId, (palette, parseError) in parseResults.items():
+            if palette is None:
+                fileStatuses[resourceId] = f"Parse failed: {parseError or 'see previous errors'}", True
+            elif not palette.length():
+                fileStatuses[resourceId] = "No colors found", True
+            else:
+                palettes[resourceId] = palette
+
+        if colorInputId and palettes:
+            fileStatuses.update(self.applyBatchPresets(palettes, batchResources, colorInputId, preparationSettings))
+
+        for resourceId, palette in palettes.items():
+            status, isError = fileStatuses.get(resourceId, (f"{palette.length()} colors", False))
+            if isError or not createBitmaps:
+                fileStatuses[resourceId] = status, isError
+                continue
+            try:
+                self.createPaletteBitmap(palette, resourceId, batchResources[resourceId], preparationSettings)
+                fileStatuses[resourceId] = f"{status}, bitmap", False
+            except Exception as e:
+                fileStatuses[resourceId] = f"{status}, bitmap failed: {e}", True
+
+        return {resourceId: fileStatuses[resourceId] for resourceId in parseResults}
+
+    def applyBatchPresets(
+            self, palettes: dict[str, Palette], batchResources: dict[str, str], colorInputId: str,
+            preparationSettings: dict[str, Any]) -> dict[str, tuple[str, bool]]:
+        """
+        Create or update the presets of every palette of a batch in a single transaction.
+        Files imported before for the same input have their presets patched, like in watch mode, instead of duplicated.
+        Files which would reuse a label of another preset of the graph, or of another file of the batch, are left out.
+        :return: Resource identifier -> (status, whether the presets of the file failed).
+        """
+        fileStatuses: dict[str, tuple[str, bool]] = {}
+        presetTransaction = PresetTransaction(
+            self.graph, colorInputId, undoLabel=f"Import presets from {len(palettes)} palettes")
+        graphPresets = self.graph.getPresets()
+        graphLabelCounts = Counter(preset.getLabel() for preset in graphPresets)
+        batchLabels: set[str] = set()  # Labels of the presets of the files accepted so far
+        createdResources: list[str] = []
+        patchedResources: dict[str, PaletteDiff] = {}
+
+        for resourceId, palette in palettes.items():
+            csvFilePath = batchResources[resourceId]
+            isReimport = self.__presetTargets.get(csvFilePath) == colorInputId and csvFilePath in self.__ownedPresets
+            if isReimport:
+                ownedPresets = self.__ownedPresets[csvFilePath]
+                pruneOwnedPresets(ownedPresets, graphPresets)
+                paletteDiff = self.__presetPalettes[csvFilePath].diff(palette)
+                newLabels = paletteDiff.added.keys() | paletteDiff.recolored.keys() | set(paletteDiff.renamed.values())
+                # The presets of the file release their labels, presets of other files keep them
+                otherLabelCounts = graphLabelCounts - Counter(ownedPresets.keys())
+            else:
+                newLabels = palette.getNames()
+                otherLabelCounts = graphLabelCounts
+
+            collidingLabels = sorted(colorName for colorName in newLabels
+                                     if otherLabelCounts[colorName] > 0 or colorName in batchLabels)
+            if collidingLabels:
+                fileStatuses[resourceId] = (
+                    f"Preset labels already used: {', '.join(collidingLabels[:5])}"
+                    + (f" and {len(collidingLabels) - 5} more" if len(collidingLabels) > 5 else ""), True)
+                continue
+            batchLabels.update(palette.getNames())
+
+            if isReimport:
+                queuePresetsPatch(presetTransaction, paletteDiff, self.__ownedPresets[csvFilePath])
+                patchedResources[resourceId] = paletteDiff
+            else:
+                presetTransaction.createFromPalette(palette)
+                createdResources.append(resourceId)
+
+        if not createdResources and not patchedResources:
+            return fileStatuses
+        isCommitted = presetTransaction.length() == 0 or presetTransaction.commit()
+        createdPresets = presetTransaction.getCreatedPresets()
+        for resourceId, paletteDiff in patchedResources.items():
+            updateOwnedPresets(presetTransaction, paletteDiff, self.__ownedPresets[batchResources[resourceId]], isCommitted)
+
+        for resourceId in createdResources + list(patchedResources):
+            if not isCommitted:
+                fileStatuses[resourceId] = "Preset creation failed, see previous errors", True
+                continue
+            csvFilePath = batchResources[resourceId]
+            palette = palettes[resourceId]
+            if resourceId in patchedResources:
+                paletteDiff = patchedResources[resourceId]
+                fileStatuses[resourceId] = "Presets up to date" if paletteDiff.isEmpty() else f"Presets updated: {paletteDiff}", False
+            else:
+                self.__ownedPresets[csvFilePath] = {colorName: createdPresets[colorName] for colorName in palette.getNames()}
+                fileStatuses[resourceId] = f"{palette.length()} presets", False
+            self.__presetPalettes[csvFilePath] = palette
+            self.__presetExclusions[csvFilePath] = set()
+            self.__presetTargets[csvFilePath] = colorInputId
+            self.__presetPreparations[csvFilePath] = preparationSettings
+        return fileStatuses
+
+    def createPaletteAtlasFromPackage(self) -> bool:
+        # Every palette resource of the package is packed whole, rows are sorted by identifier.
+        # The name filter and reduction of the dialog apply to the selected resource only, they would shift the rows.
+        if self.atlasParser.isRunning():
+            getLogger().warning("The palette atlas is already being created.")
+            return False
+        atlasResources = dict(sorted(self.gatherPaletteResources().items()))
+        if not atlasResources:
+            getLogger().info("No palette resources found in the package.")
+            return False
+
+        # Each file is parsed with its own copy of the CSV processor, their diagnostics are logged once the atlas is ready
+        atlasProcessors = {resourceId: self.csvProcessor.copy(deferDiagnostics=True) for resourceId in atlasResources}
+        self.atlasParser.start({resourceId: partial(extractPaletteFromFile, filePath, atlasProcessors[resourceId])
+                                for resourceId, filePath in atlasResources.items()})
+        self.__atlasParse = {"resources": atlasResources, "processors": atlasProcessors}
+        getLogger().info(f"Parsing {len(atlasResources)} palettes for the atlas...")
+        return True
+
+    def onAtlasPalettesReady(self) -> SDResourceBitmap | None:
+        atlasResources: dict[str, str] = self.__atlasParse["resources"]
+        atlasProcessors: dict[str, CSVColorProcessor] = self.__atlasParse["processors"]
+        self.__atlasParse = {}
+
+        atlasPalettes: dict[str, Palette] = {}
+        for resourceId, (palette, parseError) in self.atlasParser.takeResults().items():
+            filePath = atlasResources[resourceId]
+            self.csvProcessor.takeDiagnostics(atlasProcessors[resourceId], filePath)
+            if palette:
+                palette.rename(resourceId)  # Resource identifiers are unique in the package, palette names may not be
+                atlasPalettes[filePath] = palette
+            else:
+                getLogger().warning(
+                    f"Could not parse '{resourceId}'{f' ({parseError})' if parseError else ''}, it is left out of the atlas.")
+        self.__atlasPalettes = atlasPalettes
+
+        getLogger().info("Creating palette atlas...")
+        atlasImageFilePath = self.writePaletteAtlas()
+        if not atlasImageFilePath:
+            getLogger().info("No colors found in the package palettes.")
+            return None
+        atlasBitmapResource = findResourceFromFilePath(self.package, atlasImageFilePath)
+        if atlasBitmapResource:
+            getLogger().info(f"Reusing existing palette atlas resource: {atlasBitmapResource.getIdentifier()}")
+        else:
+            atlasBitmapResource = SDResourceBitmap.sNewFromFile(self.package, atlasImageFilePath, EmbedMethod.Linked)
+        return atlasBitmapResource
+
+    def writePaletteAtlas(self) -> str | None:
+        atlasImageFilePath = path.join(
+            self.packageResourcesDir, path.splitext(self.packageName)[0] + "_palette_atlas.png")
+        atlasIndex = writePaletteAtlas(list(self.__atlasPalettes.values()), atlasImageFilePath)
+        if atlasIndex is None:
+            return None
+        getLogger().info(
+            f"Packed {len(atlasIndex['palettes'])} palettes in {atlasImageFilePath} "
+            f"({atlasIndex['width']}x{atlasIndex['height']}), index written next to it.")
+        return atlasImageFilePath
+
+    def writePaletteImage(self, palette: Palette, resourceId: str) -> str:
+        # Unique colors in palette order, so that the bitmap follows the file
+        paletteImage = generatePaletteImageFromColors(list(dict.fromkeys(
+            color.rgbValues for color in palette.getColors().values() if color.rgbValues is not None)))
+        paletteImageFilePath = path.join(self.packageResourcesDir, resourceId + "_palette.png")
+        if not savePaletteImage(paletteImage, paletteImageFilePath):
+            getLogger().info(f"Palette image is up to date: {paletteImageFilePath}")
+        return paletteImageFilePath
+
+    def toggleWatchMode(self, enabled: bool) -> None:
+        if enabled:
+            self.csvWatcher.watch(self.gatherPaletteResources())
+        else:
+            self.csvWatcher.unwatchAll()
+            getLogger().info("Stopped watching CSV resources.")
+
+    def onCSVResourceChanged(self, resourceId: str, csvFilePath: str) -> None:
+        if csvFilePath == self.presetsFromCSVDialog.csvResourceCombobox.currentData():
+            self.__previewOptions = {}  # Drop the preview of the previous file contents
+            self.__preParseTimer.start()
+
+        # Only resources which have been imported before have presets, a bitmap or an atlas row to keep in sync
+        if csvFilePath not in self.__presetTargets and csvFilePath not in self.__paletteBitmapTargets \
+                and csvFilePath not in self.__atlasPalettes:
+            return
+
+        if csvFilePath in self.__atlasPalettes:
+            atlasPalette = self.extractPalette(csvFilePath)  # Unfiltered, like the palettes packed by the atlas
+            if atlasPalette:
+                atlasPalette.rename(resourceId)
+                self.__atlasPalettes[csvFilePath] = atlasPalette
+                self.writePaletteAtlas()
+            else:
+                getLogger().warning(f"Could not refresh the atlas row of '{resourceId}', the CSV could not be parsed.")
+        if csvFilePath not in self.__presetTargets and csvFilePath not in self.__paletteBitmapTargets:
+            return
+
+        presetPreparation = self.__presetPreparations.get(csvFilePath)
+        bitmapPreparation = self.__paletteBitmapTargets.get(csvFilePath)
+        newPalette: Palette | None = self.preparePalette(csvFilePath, presetPreparation or bitmapPreparation)
+        if not newPalette:
+            getLogger().warning(f"Could not refresh '{resourceId}', the CSV could not be parsed.")
+            return
+
+        if csvFilePath in self.__presetTargets:
+            excludedNames = self.__presetExclusions.get(csvFilePath, set())
+            newPresetPalette = Palette(name=newPalette.name, paletteColors=[
+                color for color in newPalette.getColors().values() if color.name not in excludedNames])
+            oldPresetPalette = self.__presetPalettes.get(csvFilePath, Palette(name=newPalette.name, paletteColors=[]))
+            paletteDiff = oldPresetPalette.diff(newPresetPalette)
+            if not paletteDiff.isEmpty():
+                getLogger().info(f"'{resourceId}' changed: {paletteDiff}")
+                ownedPresets = self.__ownedPresets.setdefault(csvFilePath, {})
+                if patchPresetsFromDiff(self.graph, paletteDiff, self.__presetTargets[csvFilePath], ownedPresets):
+                    self.__presetPalettes[csvFilePath] = newPresetPalette
+        if bitmapPreparation is not None:
+            if presetPreparation is not None and bitmapPreparation != presetPreparation:
+                newPalette = self.preparePalette(csvFilePath, bitmapPreparation)
+            if newPalette:
+                self.writePaletteImage(newPalette, resourceId)  # Skipped if unchanged, the linked resource picks up the file
+
+    def schedulePreParse(self) -> None:
+        csvFilePath: str | None = self.presetsFromCSVDialog.csvResourceCombobox.currentData()
+        if not csvFilePath:
+            self.backgroundParser.cancel()
+            self.setPalettePreview(None, {})
+            return
+
+        preparationOptions = self.getPreparationOptions(csvFilePath)
+        if preparationOptions == self.__previewOptions or self.backgroundParser.isPending(preparationOptions):
+            return
+        self.backgroundParser.schedule(preparationOptions, partial(
+            prepareDeferredPalette, csvFilePath, self.csvProcessor.copy(deferDiagnostics=True),
+            self.getPreparationSettings()))
+
+    def onPreParseReady(self) -> None:
+        csvFilePath: str | None = self.presetsFromCSVDialog.csvResourceCombobox.currentData()
+        if not csvFilePath:
+            return
+        preparationOptions = self.getPreparationOptions(csvFilePath)
+        isReady, palette = self.takePreParseResult(preparationOptions, wait=False)
+        if isReady:
+            self.setPalettePreview(palette, preparationOptions)
+
+    def takePreParseResult(self, preparationOptions: dict[str, Any], wait: bool) -> tuple[bool, Palette | None]:
+        isReady, parseResult = self.backgroundParser.takeResult(preparationOptions, wait)
+        if not isReady or parseResult is None:
+            return isReady, None
+        # Issues found on the worker thread are logged from here, as if the file had been parsed on the main thread
+        palette, parseProcessor = parseResult
+        self.csvProcessor.takeDiagnostics(parseProcessor, preparationOptions["filepath"])
+        return True, palette
+
+    def setPalettePreview(self, palette: Palette | None, preparationOptions: dict[str, Any]) -> None:
+        paletteModel = self.presetsFromCSVDialog.paletteModel
+        csvFilePath: str | None = preparationOptions.get("filepath")
+        # The selection is kept for colors which still exist when the same resource is parsed again
+        paletteModel.setPalette(palette, csvFilePath, keepSelection=paletteModel.getFilePath() == csvFilePath)
+        self.__previewOptions = preparationOptions
+
+    def getPreviewPalette(self, csvFilePath: str) -> Palette | None:
+        # The options hold the current file stamp, so a preview of older file contents does not match
+        preparationOptions = self.getPreparationOptions(csvFilePath)
+        if self.__previewOptions != preparationOptions:
+            # Consume the background parse, waiting for it if still in flight, or parse now if none matches
+            isReady, palette = self.takePreParseResult(preparationOptions, wait=True)
+            if not isReady:
+                palette = self.preparePalette(csvFilePath, self.getPreparationSettings())
+            self.setPalettePreview(palette, preparationOptions)
+        return self.presetsFromCSVDialog.paletteModel.getPalette()
+
+    def getPreviewSelection(self, csvFilePath: str) -> Palette | None:
+        self.getPreviewPalette(csvFilePath)
+        return self.presetsFromCSVDialog.paletteModel.getCheckedPalette()
+
+    def getPreparationOptions(self, csvFilePath: str) -> dict[str, Any]:
+        preparationOptions = dict(self.csvProcessor.getAllOptions())
+        preparationOptions["filepath"] = csvFilePath
+        preparationOptions["fileStamp"] = getFileStamp(csvFilePath)  # A parse is stale once the file changes on disk
+        preparationOptions.update(self.getPreparationSettings())
+        return preparationOptions
+
+    def getPreparationSettings(self) -> dict[str, Any]:
+        """
+        Get the current name filter and reduction of the dialog, as keyword arguments of preparePalette().
+        They are stored with each import, so that watch mode refreshes a file the way it was imported.
+        """
+        return {
+            "reduceColorCount": self.presetsFromCSVDialog.reduceColorCountSpinbox.value(),
+            "reduceMethod": self.presetsFromCSVDialog.reduceMethodCombobox.currentData(),
+            "nameFilter": self.presetsFromCSVDialog.nameFilterLineEdit.text().strip(),
+            "nameFilterMode": self.presetsFromCSVDialog.nameFilterModeCombobox.currentData()
+        }
+
+    def preparePalette(self, filepath: str, preparationSettings: dict[str, Any]) -> Palette | None:
+        return preparePalette(filepath, self.csvProcessor, **preparationSettings)
+
+    def extractPalette(self, filepath: str) -> Palette | None:
+        return extractPaletteFromFile(filepath, self.csvProcessor)
+
+    def gatherPaletteResources(self) -> dict[str, str]:
+        # Extensions such as '.json' also hold other data, those files are checked for a palette
+        return {resourceId: filePath for resourceId, filePath in gatherCSVResourcesPathsInPackage(
+            self.package, (".csv",) + getPaletteImporterExtensions()).items() if isPaletteFile(filePath)}
+
+    def validateCSV(self) -> bool:
+        csvFilePath: str = self.presetsFromCSVDialog.csvResourceCombobox.currentData()
+        if getPaletteImporter(csvFilePath):
+            return self.extractPalette(csvFilePath) is not None
+        return self.csvProcessor.validateCSV(csvFilePath)
+
+    def shutdown(self) -> None:
+        """
+        Stop the background work of the toolbar, e.g. when the plugin is unloaded.
+        """
+        self.__preParseTimer.stop()
+        self.backgroundParser.shutdown()
+        self.batchParser.shutdown()
+        self.atlasParser.shutdown()
+
     def displayOptions(self):
         # zip() function pairs elements by position, sum() adds each pair
         # and map() applies sum() to all pairs for element-wise tuple addition.
@@ -218,9 +917,13 @@ class PresetsFromCSVToolbar(QToolBar):
         # TODO Spawn dialog under toolbar action
         self.position = tuple(map(sum, zip(self.mapToGlobal(QPoint(0, 0)).toTuple(), (0, self.size().height()))))
 
-        self.presetsFromCSVDialog.csvResourcesFilepaths = gatherCSVResourcesPathsInPackage(self.package)
+        self.presetsFromCSVDialog.csvResourcesFilepaths = self.gatherPaletteResources()
         self.presetsFromCSVDialog.graphColorParameters = gatherGraphColorParameters(self.graph)
         self.presetsFromCSVDialog.refreshComboboxesLists()
+        self.__preParseTimer.start()  # Refresh the preview if the selected file changed while the dialog was closed
+
+        if self.watchAction.isChecked():  # Pick up CSV resources added since watch mode was enabled
+            self.csvWatcher.watch(self.presetsFromCSVDialog.csvResourcesFilepaths)
 
         self.presetsFromCSVDialog.createPresetsButton.setEnabled(
             len(self.presetsFromCSVDialog.csvResourcesFilepaths) > 0 and len(self.presetsFromCSVDialog.graphColorParameters) > 0)
@@ -237,7 +940,7 @@ class CSVOptionsDialog(QDialog):
 
         self.setObjectName("csv-options-dialog")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Popup)
-        self.setFixedSize(200, 250)
+        self.setFixedSize(200, 300)
 
         self.mainLayout = QVBoxLayout()
         self.csvDialectOption: QComboBox = self.addCSVDialectOption()
@@ -246,8 +949,10 @@ class CSVOptionsDialog(QDialog):
         self.colorRowOption: QSpinBox = self.addColorRowOption()
         self.colorSeparatorOption: QTextEdit = self.addColorSeparatorOption()
         self.colorValueFormatOption: QComboBox = self.addColorValueFormatOption()
+        self.sourceColorSpaceOption: QComboBox = self.addSourceColorSpaceOption()
         self.hasAlphaOption: QCheckBox = self.addHasAlphaOption()
         self.hasHeaderOption: QCheckBox = self.addHasHeaderOption()
+        self.tolerantParsingOption: QCheckBox = self.addTolerantParsingOption()
         self.resetButton: QPushButton = self.addResetToDefaultButton()
 
         self.setLayout(self.mainLayout)
@@ -295,6 +1000,24 @@ class CSVOptionsDialog(QDialog):
 
         return colorValueFormat
 
+    def addSourceColorSpaceOption(self) -> QComboBox:
+        sourceColorSpaceLayout = QtWidgets.QHBoxLayout()
+        sourceColorSpaceLabel = QtWidgets.QLabel(UIStr_colorSpaceLabel)
+        sourceColorSpace = QtWidgets.QComboBox()
+
+        for colorSpace in COLOR_SPACE_CHANNELS:
+            sourceColorSpace.addItem(colorSpace, userData=colorSpace)
+
+        sourceColorSpace.currentIndexChanged.connect(
+            lambda: self.csvProcessor.setOption("sourceColorSpace", sourceColorSpace.itemData(sourceColorSpace.currentIndex())))
+        sourceColorSpace.setCurrentIndex(sourceColorSpace.findData(self.csvProcessor.getOption("sourceColorSpace")))  # Initialise default value
+
+        sourceColorSpaceLayout.addWidget(sourceColorSpaceLabel)
+        sourceColorSpaceLayout.addWidget(sourceColorSpace)
+        self.mainLayout.addLayout(sourceColorSpaceLayout)
+
+        return sourceColorSpace
+
     def addHasAlphaOption(self) -> QCheckBox:
         hasAlphaLayout = QtWidgets.QHBoxLayout()
         hasAlphaLabel = QtWidgets.QLabel(UIStr_hasAlphaLabel)
@@ -338,6 +1061,21 @@ class CSVOptionsDialog(QDialog):
 
         return hasHeader
 
+    def addTolerantParsingOption(self) -> QCheckBox:
+        tolerantParsingLayout = QtWidgets.QHBoxLayout()
+        tolerantParsingLabel = QtWidgets.QLabel(UIStr_tolerantParsingLabel)
+
+        tolerantParsing = QtWidgets.QCheckBox()
+        tolerantParsing.toggled.connect(
+            lambda: self.csvProcessor.setOption("tolerantParsing", tolerantParsing.isChecked()))
+        tolerantParsing.setChecked(self.csvProcessor.getOption("tolerantParsing"))  # Initialise default value
+
+        tolerantParsingLayout.addWidget(tolerantParsingLabel)
+        tolerantParsingLayout.addWidget(tolerantParsing)
+        self.mainLayout.addLayout(tolerantParsingLayout)
+
+        return tolerantParsing
+
     def addLabelRowOption(self) -> QSpinBox:
         # TODO Make label row optional and generate label from color values if not provided
         labelRowLayout = QtWidgets.QHBoxLayout()
@@ -399,10 +1137,14 @@ class CSVOptionsDialog(QDialog):
             self.csvProcessor.getOption("colorSeparator"))
         self.colorValueFormatOption.setCurrentIndex(self.colorValueFormatOption.findData(
             self.csvProcessor.getOption("colorValueFormat")))
+        self.sourceColorSpaceOption.setCurrentIndex(self.sourceColorSpaceOption.findData(
+            self.csvProcessor.getOption("sourceColorSpace")))
         self.hasHeaderOption.setChecked(
             self.csvProcessor.getOption("hasHeader"))
         self.hasAlphaOption.setChecked(
             self.csvProcessor.getOption("hasAlpha"))
+        self.tolerantParsingOption.setChecked(
+            self.csvProcessor.getOption("tolerantParsing"))
 
         getLogger().info("CSV options have been reset.")
         self.csvProcessor.logCurrentOptions()
@@ -465,7 +1207,7 @@ class PresetsFromCSVDialog(QDialog):
 
         self.setObjectName("presets-from-csv-dialog")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Popup)
-        self.setFixedSize(200, 200)
+        self.setFixedSize(220, 750)
 
         self.csvResourcesFilepaths: dict[str, str] = {}
         self.graphColorParameters: dict[str, SDProperty] = {}
@@ -474,15 +1216,33 @@ class PresetsFromCSVDialog(QDialog):
         self.setLayout(self.mainLayout)
 
         self.csvResourceCombobox: QComboBox = QtWidgets.QComboBox()
+        self.validateButton: QPushButton = QtWidgets.QPushButton(UIStr_validateCSVButton)
         self.addCSVResourceSection()
 
+        self.nameFilterLineEdit: QLineEdit = QtWidgets.QLineEdit()
+        self.nameFilterModeCombobox: QComboBox = QtWidgets.QComboBox()
+        self.paletteModel = PaletteListModel(self)
+        self.paletteView: QListView = QtWidgets.QListView()
+        self.reduceColorCountSpinbox: QSpinBox = QtWidgets.QSpinBox()
+        self.reduceMethodCombobox: QComboBox = QtWidgets.QComboBox()
+        self.addPalettePreviewSection()
+
         self.graphColorCombobox: QComboBox = QtWidgets.QComboBox()
         self.createPresetsButton: QPushButton = QtWidgets.QPushButton(UIStr_createPresetsButton)
+        self.exportPresetsButton: QPushButton = QtWidgets.QPushButton(UIStr_exportPresetsButton)
         self.addCreatePresetsSection()
 
         self.createPaletteButton: QPushButton = QtWidgets.QPushButton(UIStr_createPaletteButton)
+        self.createAtlasButton: QPushButton = QtWidgets.QPushButton(UIStr_createAtlasButton)
         self.addCreatePaletteSection()
 
+        self.batchResourceList: QListWidget = QtWidgets.QListWidget()
+        self.batchPresetsCheckbox: QCheckBox = QtWidgets.QCheckBox(UIStr_batchPresetsLabel)
+        self.batchBitmapsCheckbox: QCheckBox = QtWidgets.QCheckBox(UIStr_batchBitmapsLabel)
+        self.batchImportButton: QPushButton = QtWidgets.QPushButton(UIStr_batchImportButton)
+        self.batchStatusLabel: QLabel = QtWidgets.QLabel()
+        self.addBatchImportSection()
+
         self.csvResourceCombobox.currentTextChanged.connect(self.refreshButtonStates)
         self.graphColorCombobox.currentTextChanged.connect(self.refreshButtonStates)
 
@@ -499,6 +1259,58 @@ class PresetsFromCSVDialog(QDialog):
 
         self.mainLayout.addLayout(csvResourceLayout)
 
+        # Validate button
+        self.mainLayout.addWidget(self.validateButton)
+
+    def addPalettePreviewSection(self) -> None:
+        palettePreviewLayout = QtWidgets.QVBoxLayout()
+
+        # Name filter, applied before the reduction
+        nameFilterLayout = QtWidgets.QHBoxLayout()
+        self.nameFilterLineEdit.setPlaceholderText(UIStr_nameFilterPlaceholder)
+        self.nameFilterLineEdit.setClearButtonEnabled(True)
+        for nameFilterMode in Palette.NAME_FILTER_MODES:
+            self.nameFilterModeCombobox.addItem(nameFilterMode, userData=nameFilterMode)
+        self.nameFilterModeCombobox.setCurrentIndex(self.nameFilterModeCombobox.findData("glob"))
+        nameFilterLayout.addWidget(self.nameFilterLineEdit)
+        nameFilterLayout.addWidget(self.nameFilterModeCombobox)
+        palettePreviewLayout.addLayout(nameFilterLayout)
+
+        # Swatch list, rows are only painted when visible
+        self.paletteView.setModel(self.paletteModel)
+        self.paletteView.setUniformItemSizes(True)
+        self.paletteView.setIconSize(QSize(16, 16))
+        palettePreviewLayout.addWidget(self.paletteView)
+
+        # Selection buttons and checked colors count
+        selectionLayout = QtWidgets.QHBoxLayout()
+        selectAllButton = QtWidgets.QPushButton(UIStr_selectAllButton)
+        selectAllButton.clicked.connect(lambda: self.paletteModel.setAllChecked(True))
+        selectNoneButton = QtWidgets.QPushButton(UIStr_selectNoneButton)
+        selectNoneButton.clicked.connect(lambda: self.paletteModel.setAllChecked(False))
+        selectionCountLabel = QtWidgets.QLabel()
+        self.paletteModel.checkedCountChanged.connect(
+            lambda checkedCount: selectionCountLabel.setText(f"{checkedCount}/{self.paletteModel.rowCount()}"))
+        selectionLayout.addWidget(selectAllButton)
+        selectionLayout.addWidget(selectNoneButton)
+        selectionLayout.addWidget(selectionCountLabel)
+        palettePreviewLayout.addLayout(selectionLayout)
+
+        # Reduction to the most representative colors, 0 keeps every color
+        reduceLayout = QtWidgets.QHBoxLayout()
+        reduceLabel = QtWidgets.QLabel(UIStr_reduceColorCountLabel)
+        self.reduceColorCountSpinbox.setRange(0, 65536)
+        self.reduceColorCountSpinbox.setSpecialValueText(UIStr_reduceColorCountOff)
+        self.reduceColorCountSpinbox.setKeyboardTracking(False)  # Reduce once the value is entered, not on every digit
+        for reduceMethod in Palette.REDUCTION_METHODS:
+            self.reduceMethodCombobox.addItem(reduceMethod, userData=reduceMethod)
+        reduceLayout.addWidget(reduceLabel)
+        reduceLayout.addWidget(self.reduceColorCountSpinbox)
+        reduceLayout.addWidget(self.reduceMethodCombobox)
+        palettePreviewLayout.addLayout(reduceLayout)
+
+        self.mainLayout.addLayout(palettePreviewLayout)
+
     def refreshComboboxesLists(self):
         self.graphColorCombobox.clear()
         self.csvResourceCombobox.clear()
@@ -515,16 +1327,47 @@ class PresetsFromCSVDialog(QDialog):
             self.csvResourceCombobox.addItem(resourceId, userData=resource)
         self.csvResourceCombobox.setCurrentIndex(0)
 
+        # Resources checked for the batch import stay checked if they still exist
+        checkedResources = self.getCheckedBatchResources()
+        self.batchResourceList.clear()
+        for resourceId, resource in self.csvResourcesFilepaths.items():
+            resourceItem = QtWidgets.QListWidgetItem(resourceId, self.batchResourceList)
+            resourceItem.setData(Qt.ItemDataRole.UserRole, resource)
+            resourceItem.setFlags(resourceItem.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            resourceItem.setCheckState(
+                Qt.CheckState.Checked if resourceId in checkedResources else Qt.CheckState.Unchecked)
+        self.batchStatusLabel.clear()
+
+    def getCheckedBatchResources(self) -> dict[str, str]:
+        checkedResources: dict[str, str] = {}
+        for itemIndex in range(self.batchResourceList.count()):
+            resourceItem = self.batchResourceList.item(itemIndex)
+            if resourceItem.checkState() == Qt.CheckState.Checked:
+                checkedResources[resourceItem.text()] = resourceItem.data(Qt.ItemDataRole.UserRole)
+        return checkedResources
+
+    def setBatchResourceStatus(self, resourceId: str, status: str, isError: bool = False) -> None:
+        for resourceItem in self.batchResourceList.findItems(resourceId, Qt.MatchFlag.MatchExactly):
+            resourceItem.setToolTip(status)
+            resourceItem.setForeground(QtGui.QBrush(Qt.GlobalColor.red) if isError else QtGui.QBrush())
+
     def refreshButtonStates(self) -> None:
         if not self.csvResourceCombobox.currentText():
+            self.validateButton.setEnabled(False)
             self.createPresetsButton.setEnabled(False)
+            self.exportPresetsButton.setEnabled(False)
             self.createPaletteButton.setEnabled(False)
+            self.createAtlasButton.setEnabled(False)
         else:
+            self.validateButton.setEnabled(True)
             self.createPaletteButton.setEnabled(True)
+            self.createAtlasButton.setEnabled(True)
             if not self.graphColorCombobox.currentText():
                 self.createPresetsButton.setEnabled(False)
+                self.exportPresetsButton.setEnabled(False)
             else:
                 self.createPresetsButton.setEnabled(True)
+                self.exportPresetsButton.setEnabled(True)
 
     def addCreatePresetsSection(self) -> None:
         separator = layoutSeparator()
@@ -542,8 +1385,9 @@ class PresetsFromCSVDialog(QDialog):
         graphColorLayout.addWidget(self.graphColorCombobox)
         createPresetsLayout.addLayout(graphColorLayout)
 
-        # Create presets button
+        # Create and export presets buttons
         createPresetsLayout.addWidget(self.createPresetsButton)
+        createPresetsLayout.addWidget(self.exportPresetsButton)
 
         self.mainLayout.addLayout(createPresetsLayout)
 
@@ -560,8 +1404,258 @@ class PresetsFromCSVDialog(QDialog):
         createPaletteButton = self.createPaletteButton
         createPaletteLayout.addWidget(createPaletteButton)
 
+        # Create atlas button, packing every palette of the package
+        self.createAtlasButton.setToolTip(UIStr_createAtlasTooltip)
+        createPaletteLayout.addWidget(self.createAtlasButton)
+
         self.mainLayout.addLayout(createPaletteLayout)
 
+    def addBatchImportSection(self) -> None:
+        separator = layoutSeparator()
+        self.mainLayout.addWidget(separator)
+        batchImportLayout = QtWidgets.QVBoxLayout()
+
+        # Title
+        batchImportLabel = QtWidgets.QLabel("<b>" + UIStr_batchImportSection + "</b>")
+        batchImportLayout.addWidget(batchImportLabel)
+
+        # Checkable resources list, the status of each file is shown as a tooltip
+        self.batchResourceList.setFixedHeight(90)
+        batchImportLayout.addWidget(self.batchResourceList)
+
+        # Presets use the color parameter of the presets section
+        batchTargetsLayout = QtWidgets.QHBoxLayout()
+        self.batchPresetsCheckbox.setChecked(True)
+        self.batchBitmapsCheckbox.setChecked(True)
+        batchTargetsLayout.addWidget(self.batchPresetsCheckbox)
+        batchTargetsLayout.addWidget(self.batchBitmapsCheckbox)
+        batchImportLayout.addLayout(batchTargetsLayout)
+
+        # Import button and batch status
+        batchImportLayout.addWidget(self.batchImportButton)
+        batchImportLayout.addWidget(self.batchStatusLabel)
+
+        self.mainLayout.addLayout(batchImportLayout)
+
+
+class PaletteListModel(QAbstractListModel):
+
+    checkedCountChanged = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__palette: Palette | None = None
+        self.__filePath: str | None = None
+        self.__colors: list[PaletteColor] = []
+        self.__uncheckedNames: set[str] = set()  # All colors are checked by default
+
+    def setPalette(self, palette: Palette | None, filePath: str | None, keepSelection: bool = False) -> None:
+        self.beginResetModel()
+        self.__palette = palette
+        self.__filePath = filePath
+        self.__colors = list(palette.getColors().values()) if palette else []
+        if keepSelection and palette:
+            self.__uncheckedNames &= palette.getNames()
+        else:
+            self.__uncheckedNames = set()
+        self.endResetModel()
+        self.checkedCountChanged.emit(self.getCheckedCount())
+
+    def getPalette(self) -> Palette | None:
+        return self.__palette
+
+    def getFilePath(self) -> str | None:
+        return self.__filePath
+
+    def getUncheckedNames(self) -> set[str]:
+        return set(self.__uncheckedNames)
+
+    def getCheckedCount(self) -> int:
+        return len(self.__colors) - len(self.__uncheckedNames)
+
+    def getCheckedPalette(self) -> Palette | None:
+        if self.__palette is None:
+            return None
+        if not self.__uncheckedNames:
+            return self.__palette
+        return Palette(name=self.__palette.name, paletteColors=[
+            color for color in self.__colors if color.name not in self.__uncheckedNames])
+
+    def setAllChecked(self, checked: bool) -> None:
+        self.__uncheckedNames = set() if checked else {color.name for color in self.__colors}
+        if self.__colors:
+            self.dataChanged.emit(self.index(0), self.index(len(self.__colors) - 1), [Qt.ItemDataRole.CheckStateRole])
+        self.checkedCountChanged.emit(self.getCheckedCount())
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.__colors)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        color = self.__colors[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return color.name
+        elif role == Qt.ItemDataRole.DecorationRole:
+            return QtGui.QColor(*color.rgbValues)  # Painted as a swatch by the view
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            return f"{color.name} - {color.hex}"
+        elif role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Unchecked if color.name in self.__uncheckedNames else Qt.CheckState.Checked
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        colorName = self.__colors[index.row()].name
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self.__uncheckedNames.discard(colorName)
+        else:
+            self.__uncheckedNames.add(colorName)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.checkedCountChanged.emit(self.getCheckedCount())
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+
+def getFileStamp(filepath: str) -> tuple[int, int] | None:
+    """
+    :return: The modification time in nanoseconds and the size of a file, None if it cannot be read.
+    """
+    try:
+        fileStat = os.stat(filepath)
+    except OSError:
+        return None
+    return fileStat.st_mtime_ns, fileStat.st_size
+
+
+def extractPaletteFromFile(
+        filepath: str, csvProcessor: CSVColorProcessor, cancelEvent: threading.Event | None = None) -> Palette | None:
+    paletteImporter = getPaletteImporter(filepath)
+    if paletteImporter:
+        return paletteImporter.extractPalette(filepath)
+    return csvProcessor.extractPalette(filepath, cancelEvent)
+
+
+def preparePalette(
+        filepath: str, csvProcessor: CSVColorProcessor, reduceColorCount: int, reduceMethod: str,
+        nameFilter: str = "", nameFilterMode: str = "glob", cancelEvent: threading.Event | None = None) -> Palette | None:
+    """
+    Extract a palette, keep the colors whose name matches the filter if any,
+    and reduce it to its most representative colors if requested.
+    Does not touch any widget, so it can run on a worker thread with a copy of the CSV processor.
+    """
+    palette = extractPaletteFromFile(filepath, csvProcessor, cancelEvent)
+    if palette and nameFilter:
+        paletteView = palette.filter(nameFilter, nameFilterMode)
+        if paletteView is None:
+            return None
+        filteredPalette = paletteView.toPalette()
+        getLogger().info(f"Name filter '{nameFilter}' ({nameFilterMode}) matched {filteredPalette.length()} of {palette.length()} colors.")
+        palette = filteredPalette
+    if not palette or reduceColorCount <= 0 or palette.length() <= reduceColorCount:
+        return palette
+    if cancelEvent and cancelEvent.is_set():
+        return None
+
+    reduction = palette.reduce(reduceColorCount, reduceMethod)
+    if reduction is None:
+        return palette
+    reducedPalette, populations = reduction
+    getLogger().info(
+        f"Reduced {palette.length()} colors to {reducedPalette.length()} ({reduceMethod}):\n" +
+        "\n".join([f"  - {colorName}: {population}" for colorName, population in populations.items()]))
+    return reducedPalette
+
+
+def prepareDeferredPalette(
+        filepath: str, csvProcessor: CSVColorProcessor, preparationSettings: dict[str, Any],
+        cancelEvent: threading.Event | None = None) -> tuple[Palette | None, CSVColorProcessor]:
+    """
+    Prepare a palette on a worker thread, see preparePalette().
+    The CSV processor is returned with the palette, so that its diagnostics are logged from the main thread:
+    it should be a copy deferring them, see CSVColorProcessor.copy().
+    """
+    return preparePalette(filepath, csvProcessor, cancelEvent=cancelEvent, **preparationSettings), csvProcessor
+
+
+def generatePresetsFromColors(
+        graph: SDSBSCompGraph, palette: Palette | None, graphInputIdentifier: str) -> dict[str, SDSBSPreset] | None:
+    """
+    :return: The created presets by label, or None if nothing was created.
+    """
+    if not palette:
+        getLogger().warning("No colors to generate presets from.")
+        return None
+    presetTransaction = PresetTransaction(graph, graphInputIdentifier, undoLabel=f"Create presets from '{palette.name}'")
+    presetTransaction.createFromPalette(palette)
+    if not presetTransaction.commit():
+        return None
+    return presetTransaction.getCreatedPresets()
+
+
+def patchPresetsFromDiff(
+        graph: SDSBSCompGraph, paletteDiff: PaletteDiff, graphInputIdentifier: str,
+        ownedPresets: dict[str, SDSBSPreset]) -> bool:
+    """
+    Apply the changes of a palette to the presets created from it.
+    Presets of the graph which are not in ownedPresets are never renamed or deleted, even if they share a label.
+    :param ownedPresets: Label -> preset created from the palette, updated in place to follow the changes.
+    :return: Whether the changes were applied.
+    """
+    pruneOwnedPresets(ownedPresets, graph.getPresets())
+    presetTransaction = PresetTransaction(graph, graphInputIdentifier, undoLabel="Update presets from CSV")
+    queuePresetsPatch(presetTransaction, paletteDiff, ownedPresets)
+    isCommitted = presetTransaction.commit()
+    updateOwnedPresets(presetTransaction, paletteDiff, ownedPresets, isCommitted)
+    return isCommitted
+
+
+def pruneOwnedPresets(ownedPresets: dict[str, SDSBSPreset], graphPresets: list[SDSBSPreset]) -> None:
+    # Presets deleted from the graph by the user since the import are no longer owned
+    for colorName in [colorName for colorName, preset in ownedPresets.items() if preset not in graphPresets]:
+        del ownedPresets[colorName]
+
+
+def queuePresetsPatch(
+        presetTransaction: PresetTransaction, paletteDiff: PaletteDiff, ownedPresets: dict[str, SDSBSPreset]) -> None:
+    """
+    Add the changes of a palette to a transaction, only the presets in ownedPresets are renamed or deleted.
+    """
+    for colorName in paletteDiff.removed | paletteDiff.recolored.keys():
+        if colorName in ownedPresets:
+            presetTransaction.delete(ownedPresets[colorName])
+    for oldName, newName in paletteDiff.renamed.items():
+        if oldName in ownedPresets:
+            presetTransaction.rename(ownedPresets[oldName], newName)
+    for color in list(paletteDiff.added.values()) + list(paletteDiff.recolored.values()):
+        presetTransaction.create(color)
+
+
+def updateOwnedPresets(
+        presetTransaction: PresetTransaction, paletteDiff: PaletteDiff, ownedPresets: dict[str, SDSBSPreset],
+        isCommitted: bool) -> None:
+    """
+    Make the presets owned by a palette follow the commit of a patch queued with queuePresetsPatch().
+    The transaction may hold the patches of other palettes.
+    """
+    if not isCommitted:
+        # Presets deleted then created again by the rollback
+        ownedPresets.update({colorName: preset for colorName, preset in presetTransaction.getRestoredPresets().items()
+                             if colorName in ownedPresets})
+        return
+    for colorName in paletteDiff.removed | paletteDiff.recolored.keys():
+        ownedPresets.pop(colorName, None)
+    renamedPresets = {
+        newName: ownedPresets.pop(oldName) for oldName, newName in paletteDiff.renamed.items() if oldName in ownedPresets}
+    ownedPresets.update(renamedPresets)
+    createdPresets = presetTransaction.getCreatedPresets()
+    ownedPresets.update({colorName: createdPresets[colorName] for colorName in paletteDiff.added.keys() | paletteDiff.recolored.keys()})
+
 
 def layoutSeparator(lineWidth: int = 5) -> QFrame:
     separator = QFrame()
@@ -0,0 +1,67 @@
+from os import path
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from .utilities import getLogger
+
+# ---
+
+class CSVResourceWatcher(QObject):
+    """
+    Watch CSV resource files on disk and report changes once per burst of file system events.
+    Editors usually save in several steps (truncate, write, rename), so events are debounced before being forwarded.
+    """
+
+    resourceChanged = Signal(str, str)  # Resource identifier, file path
+
+    def __init__(self, debounceInterval: int = 250, parent=None):
+        super().__init__(parent)
+
+        self.__watchedResources: dict[str, str] = {}  # File path -> resource identifier
+        self.__pendingFilePaths: set[str] = set()
+
+        self.__fileWatcher = QFileSystemWatcher(self)
+        self.__fileWatcher.fileChanged.connect(self.__onFileChanged)
+
+        self.__debounceTimer = QTimer(self)
+        self.__debounceTimer.setSingleShot(True)
+        self.__debounceTimer.setInterval(debounceInterval)
+        self.__debounceTimer.timeout.connect(self.__flushPendingChanges)
+
+    def watch(self, csvResourcesFilepaths: dict[str, str]) -> None:
+        self.unwatchAll()
+        self.__watchedResources = {filePath: resourceId for resourceId, filePath in csvResourcesFilepaths.items()}
+        if self.__watchedResources:
+            self.__fileWatcher.addPaths(list(self.__watchedResources.keys()))
+        getLogger().info(f"Watching {len(self.__watchedResources)} CSV resources for changes.")
+
+    def unwatchAll(self) -> None:
+        self.__debounceTimer.stop()
+        self.__pendingFilePaths.clear()
+        watchedFiles = self.__fileWatcher.files()
+        if watchedFiles:
+            self.__fileWatcher.removePaths(watchedFiles)
+        self.__watchedResources.clear()
+
+    def isWatching(self) -> bool:
+        return len(self.__watchedResources) > 0
+
+    def __onFileChanged(self, filePath: str) -> None:
+        self.__pendingFilePaths.add(filePath)
+        self.__debounceTimer.start()  # Restart the countdown on every event of the burst
+
+    def __flushPendingChanges(self) -> None:
+        pendingFilePaths = self.__pendingFilePaths
+        self.__pendingFilePaths = set()
+
+        for filePath in pendingFilePaths:
+            resourceId = self.__watchedResources.get(filePath)
+            if resourceId is None:
+                continue
+            if not path.exists(filePath):
+                getLogger().warning(f"Watched CSV resource was removed: {filePath}")
+                continue
+            # Atomic saves replace the file, which silently drops it from the watcher
+            if filePath not in self.__fileWatcher.files():
+                self.__fileWatcher.addPath(filePath)
+            self.resourceChanged.emit(resourceId, filePath)
@@ -0,0 +1,272 @@
+from abc import ABC, abstractmethod
+from os import path
+import json
+import struct
+
+import numpy as np
+
+from .utilities import getLogger
+from .palette import Palette, PaletteColor, validateHexCode
+from .color_spaces import convertToSRGBFloat, quantizeSRGB8
+
+# ---
+
+class PaletteImporter(ABC):
+    """
+    Base class of the palette file importers.
+    Importers are stateless and registered by file extension, see registerPaletteImporter().
+    """
+
+    EXTENSIONS: tuple[str, ...] = ()
+
+    @abstractmethod
+    def extractPalette(self, filepath: str) -> Palette | None:
+        ...
+
+    def isPaletteFile(self, filepath: str) -> bool:
+        """
+        Check whether a file holds a palette without importing it, e.g. for extensions shared with other data.
+        """
+        return True
+
+    @staticmethod
+    def paletteNameFromFilePath(filepath: str) -> str:
+        return path.splitext(path.basename(filepath))[0]
+
+
+class ASEImporter(PaletteImporter):
+    """
+    Adobe Swatch Exchange (.ase) importer, decoding the binary blocks straight from the file bytes.
+    """
+
+    EXTENSIONS = (".ase",)
+
+    SIGNATURE = b"ASEF"
+    BLOCK_COLOR_ENTRY = 0x0001
+    COLOR_MODEL_CHANNELS: dict[str, int] = {"RGB ": 3, "CMYK": 4, "LAB ": 3, "Gray": 1}
+    COLOR_MODEL_SPACES: dict[str, str] = {"RGB ": "sRGB", "CMYK": "CMYK", "LAB ": "Lab", "Gray": "sRGB"}
+
+    def extractPalette(self, filepath: str) -> Palette | None:
+        try:
+            with open(filepath, "rb") as aseFile:
+                aseData = memoryview(aseFile.read())
+        except OSError as e:
+            getLogger().error("ERROR:" + str(e))
+            return None
+
+        paletteColors = self.parseColors(aseData)
+        if paletteColors is None:
+            return None
+        return Palette(name=self.paletteNameFromFilePath(filepath), paletteColors=paletteColors)
+
+    def parseColors(self, aseData: memoryview) -> list[PaletteColor] | None:
+        if len(aseData) < 12 or aseData[:4] != ASEImporter.SIGNATURE:
+            getLogger().error("Invalid ASE file: missing 'ASEF' signature.")
+            return None
+
+        colorEntries: list[tuple[str | None, str, tuple[float, ...]]] = []
+        blockCount: int = struct.unpack_from(">I", aseData, 8)[0]
+        offset = 12  # Signature, version (2 x uint16) and block count (uint32)
+
+        try:
+            for _ in range(blockCount):
+                blockType, blockLength = struct.unpack_from(">HI", aseData, offset)
+                offset += 6
+                blockEnd = offset + blockLength
+                if blockEnd > len(aseData):
+                    getLogger().error(f"Invalid ASE file: block at offset {offset} is truncated.")
+                    return None
+                if blockType == ASEImporter.BLOCK_COLOR_ENTRY:  # Group start and end blocks are skipped
+                    colorEntry = self.parseColorEntry(aseData[offset:blockEnd])
+                    if colorEntry:
+                        colorEntries.append(colorEntry)
+                offset = blockEnd
+        except struct.error as e:
+            getLogger().error(f"Invalid ASE file: {e}")
+            return None
+
+        return self.convertColorEntries(colorEntries)
+
+    def parseColorEntry(self, blockData: memoryview) -> tuple[str | None, str, tuple[float, ...]] | None:
+        """
+        :return: The color name, model and channel values.
+        """
+        nameLength: int = struct.unpack_from(">H", blockData, 0)[0]  # UTF-16 code units, including the terminator
+        nameEnd = 2 + nameLength * 2
+        colorName = bytes(blockData[2:nameEnd]).decode("utf-16-be").rstrip("\x00")
+        colorModel = bytes(blockData[nameEnd:nameEnd + 4]).decode("ascii", errors="replace")
+
+        channelCount = ASEImporter.COLOR_MODEL_CHANNELS.get(colorModel)
+        if channelCount is None:
+            getLogger().warning(f"Unsupported ASE color model '{colorModel}' for color: {colorName}")
+            return None
+        channelValues: tuple[float, ...] = struct.unpack_from(f">{channelCount}f", blockData, nameEnd + 4)
+        return colorName or None, colorModel, channelValues
+
+    @staticmethod
+    def convertColorEntries(colorEntries: list[tuple[str | None, str, tuple[float, ...]]]) -> list[PaletteColor]:
+        # Colors of each model are converted together
+        floatArray = np.zeros((len(colorEntries), 3), dtype=np.float64)
+        for colorModel, colorSpace in ASEImporter.COLOR_MODEL_SPACES.items():
+            entryIndices = [entryIndex for entryIndex, colorEntry in enumerate(colorEntries) if colorEntry[1] == colorModel]
+            if not entryIndices:
+                continue
+            channelBlock = np.array([colorEntries[entryIndex][2] for entryIndex in entryIndices], dtype=np.float64)
+            if colorModel == "Gray":
+                channelBlock = np.repeat(channelBlock, 3, axis=1)
+            elif colorModel == "LAB ":
+                channelBlock[:, 0] *= 100.0  # Lightness is stored in the [0, 1] range
+            floatArray[entryIndices] = convertToSRGBFloat(channelBlock, colorSpace, isNormalized=True)
+
+        # ASE channels are floats, presets keep their precision
+        return [PaletteColor(rgbValues=tuple(rgbValues), name=colorEntry[0], floatValues=tuple(floatValues))
+                for rgbValues, floatValues, colorEntry
+                in zip(quantizeSRGB8(floatArray).tolist(), floatArray.tolist(), colorEntries)]
+
+
+class GPLImporter(PaletteImporter):
+    """
+    GIMP palette (.gpl) importer, reading the file line by line.
+    """
+
+    EXTENSIONS = (".gpl",)
+
+    HEADER = "GIMP Palette"
+
+    def extractPalette(self, filepath: str) -> Palette | None:
+        paletteName = self.paletteNameFromFilePath(filepath)
+        paletteColors: list[PaletteColor] = []
+
+        try:
+            with open(filepath, "r", encoding="utf-8") as gplFile:
+                if gplFile.readline().strip() != GPLImporter.HEADER:
+                    getLogger().error(f"Invalid GPL file: missing '{GPLImporter.HEADER}' header.")
+                    return None
+                for lineIndex, line in enumerate(gplFile, start=1):
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if line.startswith("Name:"):
+                        paletteName = line[len("Name:"):].strip() or paletteName
+                        continue
+                    if line.startswith("Columns:"):
+                        continue
+
+                    lineValues = line.split(maxsplit=3)
+                    if len(lineValues) < 3 or not all(value.isdigit() for value in lineValues[:3]):
+                        getLogger().error(f"Invalid color on line {lineIndex}: {line}")
+                        return None
+                    rgbValues = (int(lineValues[0]), int(lineValues[1]), int(lineValues[2]))
+                    colorName = lineValues[3] if len(lineValues) > 3 else None
+                    paletteColors.append(PaletteColor(rgbValues=rgbValues, name=colorName))
+        except (OSError, UnicodeDecodeError) as e:
+            getLogger().error("ERROR:" + str(e))
+            return None
+
+        return Palette(name=paletteName, paletteColors=paletteColors)
+
+
+class JSONImporter(PaletteImporter):
+    """
+    JSON palette importer. Supported layouts:
+    - A list of colors, or an object with optional "name" and a "colors" list.
+      Each color is an object with an optional "name" and either "rgb" ([R, G, B] from 0 to 255) or "hex" ("#RRGGBB").
+    - An object mapping color names to "#RRGGBB" strings or [R, G, B] lists.
+    """
+
+    EXTENSIONS = (".json",)
+
+    def extractPalette(self, filepath: str) -> Palette | None:
+        try:
+            with open(filepath, "r", encoding="utf-8") as jsonFile:
+                jsonData = json.load(jsonFile)
+        except (OSError, ValueError) as e:
+            getLogger().error("ERROR:" + str(e))
+            return None
+
+        paletteName = self.paletteNameFromFilePath(filepath)
+        if isinstance(jsonData, dict) and isinstance(jsonData.get("colors"), list):
+            paletteName = str(jsonData.get("name", paletteName))
+        colorEntries = self.getColorEntries(jsonData)
+        if colorEntries is None:
+            getLogger().error("Invalid JSON palette: expected a list or an object.")
+            return None
+
+        paletteColors: list[PaletteColor] = []
+        for colorName, colorValue in colorEntries:
+            paletteColor = self.parseColorValue(colorValue, colorName)
+            if paletteColor is None:
+                getLogger().error(f"Invalid JSON color value for '{colorName}': {colorValue}")
+                return None
+            paletteColors.append(paletteColor)
+
+        return Palette(name=paletteName, paletteColors=paletteColors)
+
+    def isPaletteFile(self, filepath: str) -> bool:
+        """
+        Check the layout of the file and that every color value is valid, so that other JSON data
+        (e.g. the index of a palette atlas) is not taken for a palette.
+        """
+        try:
+            with open(filepath, "r", encoding="utf-8") as jsonFile:
+                jsonData = json.load(jsonFile)
+        except (OSError, ValueError):
+            return False
+        colorEntries = self.getColorEntries(jsonData)
+        return bool(colorEntries) and all(self.isColorValue(colorValue) for _, colorValue in colorEntries)
+
+    @staticmethod
+    def getColorEntries(jsonData) -> list[tuple[str | None, object]] | None:
+        """
+        :return: The (name, value) pairs of the colors of any supported layout, or None if the layout is not supported.
+        """
+        if isinstance(jsonData, dict) and isinstance(jsonData.get("colors"), list):
+            colorEntries = jsonData["colors"]
+        elif isinstance(jsonData, list):
+            colorEntries = jsonData
+        elif isinstance(jsonData, dict):
+            return [(colorName, colorValue) for colorName, colorValue in jsonData.items()]
+        else:
+            return None
+        return [(colorEntry.get("name"), colorEntry.get("rgb", colorEntry.get("hex")))
+                for colorEntry in colorEntries if isinstance(colorEntry, dict)]
+
+    @staticmethod
+    def isColorValue(colorValue) -> bool:
+        if isinstance(colorValue, str):
+            return len(colorValue) == 7 and validateHexCode(colorValue.upper())
+        return isinstance(colorValue, list) and len(colorValue) == 3 and all(isinstance(value, int) for value in colorValue)
+
+    @staticmethod
+    def parseColorValue(colorValue, colorName: str | None) -> PaletteColor | None:
+        if isinstance(colorValue, str) and len(colorValue) == 7:
+            paletteColor = PaletteColor(hexCode=colorValue, name=colorName)
+            return paletteColor if paletteColor.rgbValues else None
+        if isinstance(colorValue, list) and len(colorValue) == 3 and all(isinstance(value, int) for value in colorValue):
+            return PaletteColor(rgbValues=(colorValue[0], colorValue[1], colorValue[2]), name=colorName)
+        return None
+
+# ---
+
+PALETTE_IMPORTERS: dict[str, PaletteImporter] = {}
+
+def registerPaletteImporter(importer: PaletteImporter) -> None:
+    for extension in importer.EXTENSIONS:
+        PALETTE_IMPORTERS[extension.lower()] = importer
+
+def getPaletteImporter(filepath: str) -> PaletteImporter | None:
+    return PALETTE_IMPORTERS.get(path.splitext(filepath)[1].lower())
+
+def getPaletteImporterExtensions() -> tuple[str, ...]:
+    return tuple(PALETTE_IMPORTERS.keys())
+
+def isPaletteFile(filepath: str) -> bool:
+    """
+    :return: False for files of an importer extension which do not hold a palette, True otherwise (e.g. CSV files).
+    """
+    paletteImporter = getPaletteImporter(filepath)
+    return paletteImporter is None or paletteImporter.isPaletteFile(filepath)
+
+registerPaletteImporter(ASEImporter())
+registerPaletteImporter(GPLImporter())
+registerPaletteImporter(JSONImporter())
@@ -3,9 +3,16 @@ from sd.api.sdbasetypes import ColorRGB
 from sd.api.sdvaluestring import SDValueString
 
 import csv
-from typing import Any, cast
+import fnmatch
+import re
+from bisect import bisect_left
+from itertools import chain
+from typing import Any, Callable, Iterator, cast
+
+import numpy as np
 
 from .utilities import getLogger
+from .palette_reduction import medianCut, miniBatchKMeans, groupRepresentatives
 
 # ---
 
@@ -14,7 +21,12 @@ class PaletteColor:
     HEXCODE_ALLOWLIST = {"A", "B", "C", "D", "E", "F"}
 
     def __init__(
-        self, rgbValues: tuple[int, int, int] | None = None, hexCode: str | None = None, name: str | None = None):
+        self, rgbValues: tuple[int, int, int] | None = None, hexCode: str | None = None, name: str | None = None,
+        floatValues: tuple[float, float, float] | None = None):
+        """
+        :param floatValues: The sRGB values in the [0, 1] range when the source is more precise than 8 bits (e.g. converted
+        from another color space). They are used for presets, rgbValues stay the 8-bit values used for bitmaps and matching.
+        """
 
         if rgbValues and hexCode:
             getLogger().warning("Both RGB values and hex code provided. Hex code will be ignored.")
@@ -36,6 +48,7 @@ class PaletteColor:
             self.r, self.g, self.b = self.rgbValues
         else:
             self.r, self.g, self.b = None, None, None
+        self.floatValues = floatValues if self.rgbValues else None
 
         if name:
             self.name = name
@@ -45,7 +58,9 @@ class PaletteColor:
             self.name = None
 
     def toFloat(self) -> tuple[float, float, float] | None:
-        return self.r / 255.0, self.g / 255.0, self.b / 255.0 if self.rgbValues else None
+        if self.floatValues is not None:
+            return self.floatValues
+        return (self.r / 255.0, self.g / 255.0, self.b / 255.0) if self.rgbValues else None
 
     def colorToSDValueRGB(self) -> SDValueColorRGB | None:
         return SDValueColorRGB.sNew(ColorRGB(*self.toFloat())) if self.rgbValues else None
@@ -59,6 +74,8 @@ class Palette:
     def __init__(self, name: str, paletteColors: list[PaletteColor]):
         self.name = name
         self.__colors = {paletteColor.name: paletteColor for paletteColor in paletteColors}
+        self.__sortedNames: list[str] | None = None  # Name index, built by the first search after a change
+        self.__namePositions: dict[str, int] | None = None  # Name -> position in the palette, built like the name index
 
     # GET
 
@@ -69,7 +86,20 @@ class Palette:
         return self.__colors.get(name)
 
     def getNames(self) -> set[str]:
-        return set(self.__colors.keys())
+        return set(self.__colors)
+
+    def getSortedNames(self) -> list[str]:
+        if self.__sortedNames is None:
+            self.__sortedNames = sorted(colorName for colorName in self.__colors if colorName is not None)
+        return self.__sortedNames
+
+    def getNamePositions(self) -> dict[str, int]:
+        """
+        :return: Name -> position of the color in the palette, i.e. in the file it was read from.
+        """
+        if self.__namePositions is None:
+            self.__namePositions = {colorName: position for position, colorName in enumerate(self.__colors)}
+        return self.__namePositions
 
     def getRGBValues(self) -> set[tuple[int, int, int]]:
         return {color.rgbValues for color in self.__colors.values()}
@@ -97,6 +127,8 @@ class Palette:
     def add(self, color: PaletteColor) -> bool:
         if not color.name in self.__colors:
             self.__colors[color.name] = color
+            self.__sortedNames = None
+            self.__namePositions = None
             return True
         else:
             return False
@@ -111,6 +143,8 @@ class Palette:
     def delete(self, colorName: str) -> bool:
         if colorName in self.__colors:
             self.__colors.pop(colorName)
+            self.__sortedNames = None
+            self.__namePositions = None
             return True
         else:
             return False
@@ -120,6 +154,174 @@ class Palette:
 
     def clear(self):
         self.__colors.clear()
+        self.__sortedNames = None
+        self.__namePositions = None
+
+    # SEARCH
+
+    NAME_FILTER_MODES = ("prefix", "glob", "regex")
+
+    def filter(self, pattern: str, mode: str = "glob") -> "PaletteView | None":
+        """
+        Select the colors whose name matches a pattern, without copying them.
+        Prefix and glob patterns only scan the range of the sorted name index sharing their literal prefix,
+        regular expressions are searched in every name. Matching is case-sensitive.
+        :param pattern: e.g. "Brand_Red_" (prefix), "Brand_Red_*" (glob) or "^Brand_(Red|Blue)_\\d+$" (regex).
+        :param mode: One of NAME_FILTER_MODES.
+        :return: A lazy view of the matching colors, or None if the mode or the pattern is invalid.
+        """
+        if mode == "prefix":
+            return PaletteView(self, pattern, None)
+        elif mode == "glob":
+            literalPrefix = re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+            return PaletteView(self, literalPrefix, re.compile(fnmatch.translate(pattern)).match)
+        elif mode == "regex":
+            try:
+                return PaletteView(self, "", re.compile(pattern).search)
+            except re.error as e:
+                getLogger().error(f"Invalid name filter '{pattern}': {e}")
+                return None
+        else:
+            getLogger().error(f"Unknown name filter mode: {mode} (Expected one of {Palette.NAME_FILTER_MODES})")
+            return None
+
+    def iterNamesWithPrefix(self, prefix: str) -> Iterator[str]:
+        sortedNames = self.getSortedNames()
+        for nameIndex in range(bisect_left(sortedNames, prefix), len(sortedNames)):
+            colorName = sortedNames[nameIndex]
+            if not colorName.startswith(prefix):
+                break
+            yield colorName
+
+    # REDUCE
+
+    REDUCTION_METHODS = ("median-cut", "k-means")
+
+    def reduce(self, colorCount: int, method: str = "median-cut") -> tuple["Palette", dict[str, int]] | None:
+        """
+        Reduce the palette to its most representative colors.
+        Colors are grouped by median cut or mini-batch k-means, and each group is represented by its color closest
+        to the group mean, so the reduced palette keeps original names and values.
+        :param colorCount: The maximum amount of colors of the reduced palette.
+        :param method: One of REDUCTION_METHODS.
+        :return: The reduced palette, and the amount of colors each of its colors represents.
+        """
+        if method not in Palette.REDUCTION_METHODS:
+            getLogger().error(f"Unknown reduction method: {method} (Expected one of {Palette.REDUCTION_METHODS})")
+            return None
+        colors = list(self.__colors.values())
+        if colorCount <= 0 or len(colors) <= colorCount:
+            return self, {color.name: 1 for color in colors}
+
+        rgbArray = np.fromiter(
+            chain.from_iterable(color.rgbValues for color in colors), dtype=np.uint8, count=len(colors) * 3).reshape(-1, 3)
+        if method == "median-cut":
+            groups = medianCut(rgbArray, colorCount)
+        else:
+            groups = miniBatchKMeans(rgbArray, colorCount)
+        representatives, populations = groupRepresentatives(rgbArray, groups)
+
+        reducedColors = [colors[colorIndex] for colorIndex in representatives.tolist()]
+        reducedPalette = Palette(name=self.name, paletteColors=reducedColors)
+        return reducedPalette, {color.name: population for color, population in zip(reducedColors, populations.tolist())}
+
+    # DIFF
+
+    def diff(self, other: "Palette") -> "PaletteDiff":
+        """
+        Compute the changes turning this palette into another one, in linear time.
+        A removed and an added color sharing the same values are reported as a rename.
+        Colors are compared at the precision of their presets (see PaletteColor.toFloat()), not only their 8-bit values.
+        :param other: The newer version of the palette.
+        :return: The added, removed, renamed and recolored colors.
+        """
+        paletteDiff = PaletteDiff()
+        otherColors = other.getColors()
+
+        removedByValue: dict[tuple[float, float, float] | None, list[str]] = {}
+        for colorName, color in self.__colors.items():
+            otherColor = otherColors.get(colorName)
+            if otherColor is None:
+                removedByValue.setdefault(color.toFloat(), []).append(colorName)
+            elif otherColor.toFloat() != color.toFloat():
+                paletteDiff.recolored[colorName] = otherColor
+
+        for colorName, color in otherColors.items():
+            if colorName in self.__colors:
+                continue
+            removedNames = removedByValue.get(color.toFloat())
+            if removedNames:
+                paletteDiff.renamed[removedNames.pop()] = colorName
+            else:
+                paletteDiff.added[colorName] = color
+
+        paletteDiff.removed = {colorName for removedNames in removedByValue.values() for colorName in removedNames}
+        return paletteDiff
+
+    def apply(self, paletteDiff: "PaletteDiff") -> None:
+        for colorName in paletteDiff.removed:
+            self.__colors.pop(colorName, None)
+        for oldName, newName in paletteDiff.renamed.items():
+            color = self.__colors.pop(oldName, None)
+            if color:
+                self.__colors[newName] = PaletteColor(rgbValues=color.rgbValues, name=newName, floatValues=color.floatValues)
+        self.__colors.update(paletteDiff.recolored)
+        self.__colors.update(paletteDiff.added)
+        self.__sortedNames = None
+        self.__namePositions = None
+
+
+class PaletteDiff:
+
+    def __init__(self):
+        self.added: dict[str, PaletteColor] = {}
+        self.removed: set[str] = set()
+        self.renamed: dict[str, str] = {}  # Old name -> new name
+        self.recolored: dict[str, PaletteColor] = {}  # Name -> new color
+
+    def isEmpty(self) -> bool:
+        return not (self.added or self.removed or self.renamed or self.recolored)
+
+    def length(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.renamed) + len(self.recolored)
+
+    def __str__(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, "
+                f"{len(self.renamed)} renamed, {len(self.recolored)} recolored")
+
+class PaletteView:
+    """
+    Lazy selection of the colors of a palette, see Palette.filter().
+    Names are matched on every iteration, in sorted order, against the current colors of the palette.
+    The palette built by toPalette() keeps the order of the source palette, i.e. the order of the file.
+    """
+
+    def __init__(self, palette: Palette, prefix: str, nameMatcher: Callable[[str], Any] | None):
+        self.palette = palette
+        self.prefix = prefix
+        self.nameMatcher = nameMatcher
+
+    def getNames(self) -> Iterator[str]:
+        for colorName in self.palette.iterNamesWithPrefix(self.prefix):
+            if self.nameMatcher is None or self.nameMatcher(colorName):
+                yield colorName
+
+    def getColors(self) -> Iterator[PaletteColor]:
+        colors = self.palette.getColors()
+        return (colors[colorName] for colorName in self.getNames())
+
+    def __iter__(self) -> Iterator[PaletteColor]:
+        return self.getColors()
+
+    def length(self) -> int:
+        return sum(1 for _ in self.getNames())
+
+    def toPalette(self, name: str | None = None) -> Palette:
+        # Only the matched names are put back in palette order, the rest of the palette is not visited
+        namePositions = self.palette.getNamePositions()
+        colors = self.palette.getColors()
+        return Palette(name=name or self.palette.name, paletteColors=[
+            colors[colorName] for colorName in sorted(self.getNames(), key=namePositions.__getitem__)])
 
 # ---
 
@@ -213,9 +415,9 @@ def extractColorsFromCSV(csvFilePath: str, csvOptions: dict[str, Any]) -> dict[s
     for index, row in enumerate(csvValues):
 
         # Channels split into multiple columns
-        if "," in csvOptions["colorRow"]:
+        if "," in str(csvOptions["colorRow"]):
             colorValueList: list[int] = []
-            colorColumns = csvOptions["colorRow"].split(",")
+            colorColumns = str(csvOptions["colorRow"]).split(",")
             if not len(colorColumns) == 3:
                 getLogger().error(f"Amount of color columns should be 3.")
                 return None
@@ -231,7 +433,7 @@ def extractColorsFromCSV(csvFilePath: str, csvOptions: dict[str, Any]) -> dict[s
 
         # Channels in a single column
         else:
-            columnIndex = csvOptions["colorRow"]
+            columnIndex = str(csvOptions["colorRow"])
             if not columnIndex.isdigit():
                 getLogger().error(f"Row index {columnIndex} is not a digit.")
                 return None
@@ -242,7 +444,7 @@ def extractColorsFromCSV(csvFilePath: str, csvOptions: dict[str, Any]) -> dict[s
             colorValueList = [int(v) for v in row[columnIndex].split(csvOptions["colorSeparator"])]
 
         # Convert list of values to tuple
-        colorValues = cast(tuple[int, int,int], tuple(*colorValueList))
+        colorValues = cast(tuple[int, int,int], tuple(colorValueList))
 
         if csvOptions["hasLabel"]:
             label = row[int(csvOptions["labelRow"])]
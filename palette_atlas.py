@@ -0,0 +1,86 @@
+from typing import Any
+from os import path
+import json
+
+import numpy as np
+from PIL import Image as PIL_Image
+from PIL.Image import Image
+
+from .utilities import getLogger, savePaletteImage
+from .palette import Palette
+
+# ---
+
+ATLAS_INDEX_VERSION = 1
+ATLAS_MAX_WIDTH = 1024
+
+
+def packPaletteAtlas(palettes: list[Palette], maxWidth: int = ATLAS_MAX_WIDTH) -> tuple[Image, dict[str, Any]] | None:
+    """
+    Pack palettes into a single image, one block of rows per palette in the given order.
+    The atlas is as wide as the largest palette, up to maxWidth: larger palettes wrap onto as many rows as needed.
+    The last row of each block repeats the last color of the palette, so that filtering stays in the palette.
+    :param palettes: The palettes to pack, empty palettes are skipped.
+    :param maxWidth: The maximum width of the atlas, in pixels.
+    :return: The atlas image and its index, or None if there is no color to pack.
+    """
+    paletteRows: list[tuple[str, list[tuple[int, int, int]]]] = []
+    for palette in palettes:
+        rgbValues = [color.rgbValues for color in palette.getColors().values() if color.rgbValues is not None]
+        if rgbValues:
+            paletteRows.append((palette.name, rgbValues))
+        else:
+            getLogger().warning(f"Palette '{palette.name}' has no colors, it is left out of the atlas.")
+    if not paletteRows:
+        return None
+
+    atlasWidth = min(max(1, maxWidth), max(len(rgbValues) for _, rgbValues in paletteRows))
+    blockRowCounts = [-(-len(rgbValues) // atlasWidth) for _, rgbValues in paletteRows]  # Ceiling division
+    atlasHeight = sum(blockRowCounts)
+    atlasPixels = np.empty((atlasHeight, atlasWidth, 3), dtype=np.uint8)
+    atlasIndex: dict[str, Any] = {
+        "version": ATLAS_INDEX_VERSION,
+        "width": atlasWidth,
+        "height": atlasHeight,
+        "palettes": {}
+    }
+
+    row = 0
+    for (paletteName, rgbValues), blockRowCount in zip(paletteRows, blockRowCounts):
+        blockPixels = atlasPixels[row:row + blockRowCount].reshape(-1, 3)  # Colors wrap from one row to the next
+        blockPixels[:len(rgbValues)] = rgbValues
+        blockPixels[len(rgbValues):] = rgbValues[-1]
+        atlasIndex["palettes"][paletteName] = {
+            "row": row,
+            "rows": blockRowCount,
+            "count": len(rgbValues),
+            "offset": (row + 0.5) / atlasHeight  # Normalized V coordinate of the center of the first row
+        }
+        row += blockRowCount
+
+    return PIL_Image.fromarray(atlasPixels), atlasIndex
+
+
+def writePaletteAtlas(palettes: list[Palette], imageFilePath: str) -> dict[str, Any] | None:
+    """
+    Pack palettes into an atlas PNG, and write its index next to it as JSON (same path, '.json' extension).
+    Files already holding the same content are not written again.
+    :return: The atlas index, or None if there is no color to pack.
+    """
+    packedAtlas = packPaletteAtlas(palettes)
+    if packedAtlas is None:
+        return None
+    atlasImage, atlasIndex = packedAtlas
+
+    if not savePaletteImage(atlasImage, imageFilePath):
+        getLogger().info(f"Palette atlas is up to date: {imageFilePath}")
+
+    indexFilePath = path.splitext(imageFilePath)[0] + ".json"
+    indexContent = json.dumps(atlasIndex, indent=4)
+    if path.exists(indexFilePath):
+        with open(indexFilePath, "r", encoding="utf-8") as indexFile:
+            if indexFile.read() == indexContent:
+                return atlasIndex
+    with open(indexFilePath, "w", encoding="utf-8") as indexFile:
+        indexFile.write(indexContent)
+    return atlasIndex
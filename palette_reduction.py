@@ -0,0 +1,106 @@
+import numpy as np
+
+# ---
+
+def medianCut(rgbArray: np.ndarray, colorCount: int) -> list[np.ndarray]:
+    """
+    Split colors into groups with the median cut algorithm.
+    The group with the widest channel range is split at the median of that channel until there are enough groups.
+    :param rgbArray: The colors to reduce, as a (N, 3) array.
+    :param colorCount: The maximum amount of groups.
+    :return: The indices of the colors of each group.
+    """
+    rgbArray = rgbArray.astype(np.int16, copy=False)
+    groups: list[np.ndarray] = [np.arange(len(rgbArray))]
+    groupColors: list[np.ndarray] = [rgbArray]  # Colors of each group, to avoid gathering them on every split
+    initialChannel, initialRange = channelRange(rgbArray)
+    groupChannels: list[int] = [initialChannel]
+    groupRanges: list[int] = [initialRange]
+
+    while len(groups) < colorCount:
+        groupIndex = int(np.argmax(groupRanges))
+        if groupRanges[groupIndex] == 0:
+            break  # Every remaining group holds a single color value
+        indices, colors = groups[groupIndex], groupColors[groupIndex]
+        splitIndex = len(indices) // 2
+        partition = np.argpartition(colors[:, groupChannels[groupIndex]], splitIndex)
+        lowerPartition, upperPartition = partition[:splitIndex], partition[splitIndex:]
+
+        # Lower half replaces the split group, upper half is appended
+        groups[groupIndex], groupColors[groupIndex] = indices[lowerPartition], colors[lowerPartition]
+        groupChannels[groupIndex], groupRanges[groupIndex] = channelRange(groupColors[groupIndex])
+        groups.append(indices[upperPartition])
+        groupColors.append(colors[upperPartition])
+        upperChannel, upperRange = channelRange(groupColors[-1])
+        groupChannels.append(upperChannel)
+        groupRanges.append(upperRange)
+
+    return groups
+
+
+def miniBatchKMeans(
+        rgbArray: np.ndarray, colorCount: int, batchSize: int = 4096, iterations: int = 100, seed: int = 0) -> list[np.ndarray]:
+    """
+    Split colors into groups with mini-batch k-means, seeded with the median cut groups.
+    :param rgbArray: The colors to reduce, as a (N, 3) array.
+    :param colorCount: The maximum amount of groups.
+    :param batchSize: The amount of colors sampled per iteration.
+    :param iterations: The amount of center updates.
+    :param seed: The seed of the batch sampling.
+    :return: The indices of the colors of each non-empty group.
+    """
+    rgbArray = rgbArray.astype(np.float32, copy=False)
+    centers = np.array([rgbArray[indices].mean(axis=0) for indices in medianCut(rgbArray, colorCount)], dtype=np.float32)
+    centerCounts = np.zeros(len(centers), dtype=np.float64)
+    randomGenerator = np.random.default_rng(seed)
+
+    for _ in range(iterations):
+        batch = rgbArray[randomGenerator.integers(0, len(rgbArray), size=min(batchSize, len(rgbArray)))]
+        batchLabels = nearestCenters(batch, centers)
+        batchCounts = np.bincount(batchLabels, minlength=len(centers))
+        batchSums = np.zeros_like(centers)
+        np.add.at(batchSums, batchLabels, batch)
+        # Per-center learning rate decreasing with the amount of colors seen so far
+        updated = batchCounts > 0
+        centerCounts[updated] += batchCounts[updated]
+        learningRates = (batchCounts[updated] / centerCounts[updated])[:, np.newaxis].astype(np.float32)
+        centers[updated] += learningRates * (batchSums[updated] / batchCounts[updated][:, np.newaxis] - centers[updated])
+
+    labels = nearestCenters(rgbArray, centers)
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    return [indices for indices in np.split(order, boundaries) if len(indices)]
+
+
+def nearestCenters(rgbArray: np.ndarray, centers: np.ndarray, chunkSize: int = 65536) -> np.ndarray:
+    labels = np.empty(len(rgbArray), dtype=np.intp)
+    centersSquaredNorm = np.einsum("ij,ij->i", centers, centers)
+    for chunkStart in range(0, len(rgbArray), chunkSize):
+        chunk = rgbArray[chunkStart:chunkStart + chunkSize]
+        # |x - c|^2 without the |x|^2 term, which does not change the nearest center
+        distances = centersSquaredNorm[np.newaxis, :] - 2.0 * (chunk @ centers.T)
+        labels[chunkStart:chunkStart + chunkSize] = np.argmin(distances, axis=1)
+    return labels
+
+
+def channelRange(rgbArray: np.ndarray) -> tuple[int, int]:
+    """
+    :return: The index of the channel with the widest range, and that range.
+    """
+    ranges = rgbArray.max(axis=0) - rgbArray.min(axis=0)
+    channel = int(np.argmax(ranges))
+    return channel, int(ranges[channel])
+
+
+def groupRepresentatives(rgbArray: np.ndarray, groups: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pick the color of each group which is the closest to the group mean.
+    :return: The indices of the representative colors, and the population of each group.
+    """
+    rgbArray = rgbArray.astype(np.float32, copy=False)
+    representatives = np.empty(len(groups), dtype=np.intp)
+    for groupIndex, indices in enumerate(groups):
+        groupColors = rgbArray[indices]
+        squaredDistances = ((groupColors - groupColors.mean(axis=0)) ** 2).sum(axis=1)
+        representatives[groupIndex] = indices[np.argmin(squaredDistances)]
+    return representatives, np.array([len(indices) for indices in groups], dtype=np.int64)
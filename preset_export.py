@@ -0,0 +1,79 @@
+from typing import Iterable
+from xml.sax.saxutils import quoteattr
+import xml.etree.ElementTree as ElementTree
+
+from .palette import Palette, PaletteColor
+
+# ---
+
+SBSPRS_FORMAT_VERSION = "1.1"
+
+# Substance parameter types, as written in the 'type' attribute of preset inputs
+SBS_TYPE_FLOAT3 = 1024
+SBS_TYPE_FLOAT4 = 2048
+
+
+def findGraphInputUid(packageFilePath: str, graphIdentifier: str, graphInputIdentifier: str) -> str | None:
+    """
+    Read the UID of a graph input from a saved package (.sbs), the SD API does not expose it.
+    :return: The UID, or None if the graph or the input is not in the saved file.
+    """
+    try:
+        packageRoot = ElementTree.parse(packageFilePath).getroot()
+    except (OSError, ElementTree.ParseError):
+        return None
+    # Graphs may be nested in folders of the package, values are held by the 'v' attribute of each field
+    for graphElement in packageRoot.iter("graph"):
+        if graphElement.find("identifier[@v]") is None or graphElement.find("identifier").get("v") != graphIdentifier:
+            continue
+        for paramInput in graphElement.iterfind("paraminputs/paraminput"):
+            identifierElement, uidElement = paramInput.find("identifier"), paramInput.find("uid")
+            if identifierElement is not None and identifierElement.get("v") == graphInputIdentifier and uidElement is not None:
+                return uidElement.get("v")
+    return None
+
+
+def exportPresetsToSBSPRS(
+        palette: Palette, filepath: str, graphUrl: str, graphInputIdentifier: str, inputUid: str,
+        inputType: int = SBS_TYPE_FLOAT4) -> int:
+    """
+    Write one preset per palette color to a Substance preset file (.sbsprs).
+    Presets are streamed to the file as they are generated, no SD API call is made.
+    :param palette: The colors to write presets for.
+    :param filepath: The path of the .sbsprs file.
+    :param graphUrl: The package URL of the graph the presets apply to (e.g. "pkg://my_graph").
+    :param graphInputIdentifier: The identifier of the color input set by the presets.
+    :param inputType: SBS_TYPE_FLOAT3 or SBS_TYPE_FLOAT4, matching the type of the color input.
+    :param inputUid: The UID of the color input, see findGraphInputUid().
+    :return: The amount of written presets.
+    """
+    presetCount = sum(1 for color in palette.getColors().values() if color.rgbValues is not None)
+    with open(filepath, "w", encoding="utf-8", newline="\n") as presetFile:
+        return writeSBSPRS(presetFile, palette.getColors().values(), presetCount, graphUrl,
+                           graphInputIdentifier, inputUid, inputType)
+
+
+def writeSBSPRS(
+        presetFile, colors: Iterable[PaletteColor], presetCount: int, graphUrl: str, graphInputIdentifier: str,
+        inputUid: str, inputType: int = SBS_TYPE_FLOAT4) -> int:
+    presetFile.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    presetFile.write(f'<sbspresets formatversion="{SBSPRS_FORMAT_VERSION}" count="{presetCount}">\n')
+
+    # Attributes shared by every preset, escaped once
+    graphUrlAttribute = quoteattr(graphUrl)
+    inputAttributes = f'identifier={quoteattr(graphInputIdentifier)} uid={quoteattr(inputUid)} type="{inputType}"'
+    alphaValue = ",1" if inputType == SBS_TYPE_FLOAT4 else ""  # Opaque alpha
+
+    writtenCount = 0
+    for color in colors:
+        if color.rgbValues is None:
+            continue
+        colorValue = ",".join([f"{channelValue:.6g}" for channelValue in color.toFloat()]) + alphaValue
+        presetFile.write(
+            f" <sbspreset pkgurl={graphUrlAttribute} label={quoteattr(color.name)}>\n"
+            f'  <presetinput {inputAttributes} value="{colorValue}"/>\n'
+            f" </sbspreset>\n")
+        writtenCount += 1
+
+    presetFile.write("</sbspresets>\n")
+    return writtenCount
@@ -0,0 +1,154 @@
+from collections import Counter
+
+from sd.api.sdhistoryutils import SDHistoryUtils
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.sbs.sdsbscompgraph import SDSBSCompGraph
+from sd.api.sbs.sdsbspreset import SDSBSPreset
+
+from .utilities import getLogger
+from .palette import Palette, PaletteColor
+
+# ---
+
+class PresetTransaction:
+    """
+    Batch of preset changes on a graph, validated as a whole before the graph is touched,
+    then applied as a single undo step.
+    Renames and deletions apply to the given presets only, e.g. the presets created by an earlier import of the same file
+    (see getCreatedPresets()), never to other presets sharing their label.
+    If anything fails, every change is reverted within the same undo step: created presets are deleted, renamed presets
+    get their label back and deleted presets are created again with their inputs (see getRestoredPresets()).
+    """
+
+    def __init__(self, graph: SDSBSCompGraph, graphInputIdentifier: str, undoLabel: str = "Presets from CSV"):
+        self.graph = graph
+        self.graphInputIdentifier = graphInputIdentifier
+        self.undoLabel = undoLabel
+        self.__creations: list[PaletteColor] = []
+        self.__renames: list[tuple[SDSBSPreset, str]] = []  # Preset -> new label
+        self.__deletions: list[SDSBSPreset] = []
+        self.__createdPresets: dict[str, SDSBSPreset] = {}
+        self.__restoredPresets: dict[str, SDSBSPreset] = {}
+
+    def create(self, color: PaletteColor) -> None:
+        self.__creations.append(color)
+
+    def createFromPalette(self, palette: Palette) -> None:
+        self.__creations.extend(palette.getColors().values())
+
+    def rename(self, preset: SDSBSPreset, newLabel: str) -> None:
+        self.__renames.append((preset, newLabel))
+
+    def delete(self, preset: SDSBSPreset) -> None:
+        self.__deletions.append(preset)
+
+    def length(self) -> int:
+        return len(self.__creations) + len(self.__renames) + len(self.__deletions)
+
+    def getCreatedPresets(self) -> dict[str, SDSBSPreset]:
+        """
+        :return: Label -> preset created by the last successful commit.
+        """
+        return dict(self.__createdPresets)
+
+    def getRestoredPresets(self) -> dict[str, SDSBSPreset]:
+        """
+        :return: Label -> preset created again by the rollback of the last commit, in place of a deleted preset.
+        """
+        return dict(self.__restoredPresets)
+
+    def validate(self) -> list[str]:
+        errors: list[str] = []
+        inputIdentifiers = {inputProperty.getId() for inputProperty in self.graph.getProperties(SDPropertyCategory.Input)}
+        if self.__creations and self.graphInputIdentifier not in inputIdentifiers:
+            errors.append(f"Graph input not found: {self.graphInputIdentifier}")
+
+        # Labels of the graph once the renamed and deleted presets have released theirs
+        labelCounts = Counter(preset.getLabel() for preset in self.graph.getPresets())
+        labelCounts.subtract(preset.getLabel() for preset in self.__deletions)
+        labelCounts.subtract(preset.getLabel() for preset, _ in self.__renames)
+        takenLabels = {label for label, labelCount in labelCounts.items() if labelCount > 0}
+        for _, newLabel in self.__renames:
+            if newLabel in takenLabels:
+                errors.append(f"Preset label already used in the graph: {newLabel}")
+            takenLabels.add(newLabel)
+
+        createdLabels: set[str] = set()
+        for color in self.__creations:
+            if not color.name:
+                errors.append(f"Color without name: {color.rgbValues}")
+            elif color.name in createdLabels:
+                errors.append(f"Duplicate preset label: {color.name}")
+            elif color.name in takenLabels:
+                errors.append(f"Preset label already used in the graph: {color.name}")
+            if color.rgbValues is None:
+                errors.append(f"Color without value: {color.name}")
+            createdLabels.add(color.name)
+        return errors
+
+    def commit(self) -> bool:
+        self.__createdPresets = {}
+        self.__restoredPresets = {}
+        errors = self.validate()
+        if errors:
+            getLogger().error(
+                f"Preset transaction aborted, {len(errors)} errors:\n" + "\n".join([f"  - {error}" for error in errors]))
+            return False
+
+        # Convert every value before the first change to the graph
+        presetValues = [(color.name, color.colorToSDValueRGB()) for color in self.__creations]
+        createdPresets: list[SDSBSPreset] = []
+        renamedPresets: list[tuple[SDSBSPreset, str]] = []  # Preset -> old label
+        deletedPresets: list[tuple[str, list[tuple[str, object]]]] = []  # Label and inputs of each deleted preset
+
+        # The rollback runs inside the undo group, so a failed batch leaves no change behind in the history
+        with SDHistoryUtils.UndoGroup(self.undoLabel):
+            try:
+                for presetLabel, presetValue in presetValues:
+                    preset = self.graph.newPreset(presetLabel)
+                    createdPresets.append(preset)
+                    preset.addInput(self.graphInputIdentifier, presetValue)
+
+                for preset, newLabel in self.__renames:
+                    oldLabel = preset.getLabel()
+                    preset.setLabel(newLabel)
+                    renamedPresets.append((preset, oldLabel))
+
+                for preset in self.__deletions:
+                    # Captured before deleting, to create the preset again on rollback
+                    presetInputs = [(presetInput.getIdentifier(), presetInput.getValue()) for presetInput in preset.getInputs()]
+                    presetLabel = preset.getLabel()
+                    self.graph.deletePreset(preset)
+                    deletedPresets.append((presetLabel, presetInputs))
+            except Exception as e:
+                getLogger().error(f"Preset transaction failed, rolling back: {e}")
+                self.__rollback(createdPresets, renamedPresets, deletedPresets)
+                return False
+
+        self.__createdPresets = dict(zip([presetLabel for presetLabel, _ in presetValues], createdPresets))
+        getLogger().info(
+            f"Applied presets: {len(createdPresets)} created, {len(renamedPresets)} renamed, "
+            f"{len(deletedPresets)} deleted.")
+        return True
+
+    def __rollback(
+            self, createdPresets: list[SDSBSPreset], renamedPresets: list[tuple[SDSBSPreset, str]],
+            deletedPresets: list[tuple[str, list[tuple[str, object]]]]) -> None:
+        for preset in createdPresets:
+            try:
+                self.graph.deletePreset(preset)
+            except Exception as e:
+                getLogger().error(f"Could not delete created preset during rollback: {e}")
+        for preset, oldLabel in renamedPresets:
+            try:
+                preset.setLabel(oldLabel)
+            except Exception as e:
+                getLogger().error(f"Could not restore preset label during rollback: {e}")
+        for presetLabel, presetInputs in deletedPresets:
+            try:
+                preset = self.graph.newPreset(presetLabel)
+                for inputIdentifier, inputValue in presetInputs:
+                    preset.addInput(inputIdentifier, inputValue)
+                self.__restoredPresets[presetLabel] = preset
+            except Exception as e:
+                getLogger().error(f"Could not restore deleted preset '{presetLabel}' during rollback: {e}")
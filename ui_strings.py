@@ -5,14 +5,42 @@ UIStr_toolbarToggleLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"Presets From CSV", None)
 UIStr_toolbarToggleTooltip = QCoreApplication.translate(
     "PresetsFromCSV", u"Toggle 'Presets From CSV' toolbar.", None)
+UIStr_watchActionTooltip = QCoreApplication.translate(
+    "PresetsFromCSV", u"Refresh presets and palettes automatically when their CSV resource changes.", None)
 
 # 'Create' dialog
 UIStr_csvResourceLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"CSV resource:", None)
+UIStr_validateCSVButton = QCoreApplication.translate(
+    "PresetsFromCSV", u"Validate", None)
+UIStr_selectAllButton = QCoreApplication.translate(
+    "PresetsFromCSV", u"All", None)
+UIStr_selectNoneButton = QCoreApplication.translate(
+    "PresetsFromCSV", u"None", None)
+UIStr_nameFilterPlaceholder = QCoreApplication.translate(
+    "PresetsFromCSV", u"Filter names (e.g. Brand_Red_*)", None)
+UIStr_reduceColorCountLabel = QCoreApplication.translate(
+    "PresetsFromCSV", u"Reduce to:", None)
+UIStr_reduceColorCountOff = QCoreApplication.translate(
+    "PresetsFromCSV", u"Off", None)
 UIStr_createPresetsButton = QCoreApplication.translate(
     "PresetsFromCSV", u"Create presets", None)
+UIStr_exportPresetsButton = QCoreApplication.translate(
+    "PresetsFromCSV", u"Export presets file", None)
 UIStr_createPaletteButton = QCoreApplication.translate(
     "PresetsFromCSV", u"Create palette", None)
+UIStr_createAtlasButton = QCoreApplication.translate(
+    "PresetsFromCSV", u"Create atlas", None)
+UIStr_createAtlasTooltip = QCoreApplication.translate(
+    "PresetsFromCSV", u"Pack every palette of the package in a single bitmap, one block of rows per palette", None)
+UIStr_batchImportSection = QCoreApplication.translate(
+    "PresetsFromCSV", u"IMPORT", None)
+UIStr_batchPresetsLabel = QCoreApplication.translate(
+    "PresetsFromCSV", u"Presets", None)
+UIStr_batchBitmapsLabel = QCoreApplication.translate(
+    "PresetsFromCSV", u"Bitmaps", None)
+UIStr_batchImportButton = QCoreApplication.translate(
+    "PresetsFromCSV", u"Import checked", None)
 UIStr_colorParameterLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"Color parameter:", None)
 UIStr_createPresetsSection = QCoreApplication.translate(
@@ -33,9 +61,13 @@ UIStr_hasAlphaLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"Has alpha:", None)
 UIStr_colorFormatLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"Color format:", None)
+UIStr_colorSpaceLabel = QCoreApplication.translate(
+    "PresetsFromCSV", u"Color space:", None)
 UIStr_colorSeparatorLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"Color separator:", None)
 UIStr_colorRowLabel = QCoreApplication.translate(
     "PresetsFromCSV", u"Color row:", None)
+UIStr_tolerantParsingLabel = QCoreApplication.translate(
+    "PresetsFromCSV", u"Skip invalid rows:", None)
 UIStr_optionsResetButton = QCoreApplication.translate(
     "PresetsFromCSV", u"Reset", None)
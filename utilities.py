@@ -1,5 +1,6 @@
 import sd
 from sd.api.sdpackage import SDPackage
+from sd.api.sdresource import SDResource
 from sd.api.sdproperty import SDProperty, SDPropertyCategory
 from sd.api.sbs.sdsbscompgraph import SDSBSCompGraph
 from sd.api.sdtypefloat3 import SDTypeFloat3
@@ -8,6 +9,9 @@ from sd.api.sdvaluestring import SDValueString
 
 from PIL import Image as PIL_Image
 from PIL.Image import Image
+from PIL.PngImagePlugin import PngInfo
+from os import path
+import hashlib
 import logging
 
 # --- Initialise logger ---
@@ -47,15 +51,23 @@ def gatherGraphColorParameters(graph: SDSBSCompGraph) -> dict[str, SDProperty] |
         return None
 
 
-def gatherCSVResourcesPathsInPackage(package: SDPackage) -> dict[str, str]:
+def gatherCSVResourcesPathsInPackage(package: SDPackage, extensions: tuple[str, ...] = (".csv",)) -> dict[str, str]:
     csvResources: dict[str, str] = {}
     for resource in package.getChildrenResources(isRecursive=True):
             resourceFilepath: str = resource.getFilePath()
-            if resourceFilepath.endswith(".csv"):
+            if resourceFilepath.lower().endswith(extensions):
                     csvResources[resource.getIdentifier()] = resourceFilepath
     return csvResources
 
 
+def findResourceFromFilePath(package: SDPackage, filepath: str) -> SDResource | None:
+    normalizedFilepath = path.normcase(path.normpath(filepath))
+    for resource in package.getChildrenResources(isRecursive=True):
+        if path.normcase(path.normpath(resource.getFilePath())) == normalizedFilepath:
+            return resource
+    return None
+
+
 def getCSVResourceFilePath(package: SDPackage, resourcePkgPath : str) -> str | None:
     resource = package.findResourceFromUrl(resourcePkgPath)
     if not resource:
@@ -72,3 +84,32 @@ def generatePaletteImageFromColors(rgbValues: list[tuple[int, int, int]], size:
     paletteImage = PIL_Image.new("RGB", size)
     paletteImage.putdata(rgbValues)
     return paletteImage
+
+PALETTE_HASH_KEY = "PaletteHash"
+
+def hashImagePixels(image: Image) -> str:
+    pixelsHash = hashlib.sha1(f"{image.mode}{image.size}".encode("utf-8"))
+    pixelsHash.update(image.tobytes())
+    return pixelsHash.hexdigest()
+
+def savePaletteImage(image: Image, filepath: str) -> bool:
+    """
+    Save a palette image as PNG, unless the file on disk already holds the same pixels.
+    The pixels hash is stored in a PNG text chunk, which is read back without decoding the existing image.
+    :param image: The palette image to save.
+    :param filepath: The path of the PNG file.
+    :return: True if the file has been written, False if it was already up to date.
+    """
+    pixelsHash = hashImagePixels(image)
+    if path.exists(filepath):
+        try:
+            with PIL_Image.open(filepath) as existingImage:
+                if existingImage.info.get(PALETTE_HASH_KEY) == pixelsHash:
+                    return False
+        except OSError as e:
+            getLogger().warning(f"Could not read existing palette image, it will be overwritten: {e}")
+
+    pngInfo = PngInfo()
+    pngInfo.add_text(PALETTE_HASH_KEY, pixelsHash)
+    image.save(filepath, pnginfo=pngInfo)
+    return True